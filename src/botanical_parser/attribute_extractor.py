@@ -5,13 +5,63 @@ Uses the Template Method pattern with specialized extractors for different attri
 import re
 import logging
 from abc import ABC, abstractmethod
-from typing import List, Optional, Dict, Pattern
+from typing import List, Optional, Dict, Pattern, Tuple, Union
 from .attribute_node import AttributeNode
 from .attribute_value import AttributeValue
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# Characters that make a value word a regex rather than a plain literal
+_REGEX_METACHARACTERS = frozenset('.^$*+?{}[]\\|()')
+
+# The second number of a "start--end" range and an optional unit
+_RANGE_END_RE = re.compile(r'\s*(\d+(?:\.\d+)?)\s*([a-zA-Z]+)?')
+
+# A typical value with a parenthetical maximum and an optional unit, e.g. "10(15) cm"
+_PARENTHETICAL_RE = re.compile(r'(\d+(?:\.\d+)?)\s*\((\d+(?:\.\d+)?)\)\s*([a-zA-Z]+)?')
+
+# A number followed by its unit, e.g. "5 mm"
+_NUMBER_UNIT_RE = re.compile(r'(\d+(?:\.\d+)?)\s*([a-zA-Z]+)')
+
+
+def _is_number(text: str) -> bool:
+    """
+    Check whether text is a whole number or decimal, as matched by \\d+(?:\\.\\d+)?.
+    
+    Args:
+        text: The text to check.
+        
+    Returns:
+        True if text is a number, False otherwise.
+    """
+    whole, point, fraction = text.partition('.')
+    return whole.isdecimal() and (not point or fraction.isdecimal())
+
+
+def _parse_range(text: str) -> Optional[Tuple[str, str, Optional[str]]]:
+    """
+    Split a range like "8--25 dm" at its "--" separator.
+    
+    Args:
+        text: The value text to parse.
+        
+    Returns:
+        Tuple of start value, end value and unit (or None), or None if text
+        doesn't start with a range.
+    """
+    head, separator, tail = text.partition('--')
+    if not separator:
+        return None
+    start_val = head.rstrip()
+    if not _is_number(start_val):
+        return None
+    end_match = _RANGE_END_RE.match(tail)
+    if not end_match:
+        return None
+    end_val, unit = end_match.groups()
+    return start_val, end_val, unit
+
 
 class AttributeExtractor(ABC):
     """
@@ -27,16 +77,18 @@ class AttributeExtractor(ABC):
             name: The name of the attribute to extract.
         """
         self.name = name
-        self.pattern = re.compile(self.generate_pattern(), re.IGNORECASE)
+        pattern = self.generate_pattern()
+        # Precompiled patterns are used as-is; strings are compiled case-insensitively
+        self.pattern = pattern if isinstance(pattern, re.Pattern) else re.compile(pattern, re.IGNORECASE)
     
     @abstractmethod
-    def generate_pattern(self) -> str:
+    def generate_pattern(self) -> Union[str, Pattern]:
         """
         Generate the regex pattern for matching this attribute.
         To be implemented by subclasses.
         
         Returns:
-            Regex pattern string
+            Regex pattern string, or an already compiled pattern
         """
         pass
         
@@ -173,16 +225,16 @@ class NumericAttributeExtractor(AttributeExtractor):
         values = []
         
         # Handle ranges with dashes (e.g., "8--25 dm")
-        range_match = re.match(r'(\d+(?:\.\d+)?)\s*--\s*(\d+(?:\.\d+)?)\s*([a-zA-Z]+)?', text)
+        range_parts = _parse_range(text)
         
-        if range_match:
-            start_val, end_val, unit = range_match.groups()
+        if range_parts:
+            start_val, end_val, unit = range_parts
             values.append(AttributeValue(start_val, unit=unit, is_range_start=True))
             values.append(AttributeValue(end_val, unit=unit, is_range_end=True))
             return values
         
         # Check for parenthetical max values (e.g., "10(15) cm")
-        parenthetical_match = re.match(r'(\d+(?:\.\d+)?)\s*\((\d+(?:\.\d+)?)\)\s*([a-zA-Z]+)?', text)
+        parenthetical_match = _PARENTHETICAL_RE.match(text)
         if parenthetical_match:
             typical_val, max_val, unit = parenthetical_match.groups()
             values.append(AttributeValue(typical_val, unit=unit))
@@ -190,7 +242,7 @@ class NumericAttributeExtractor(AttributeExtractor):
             return values
         
         # Handle simple value with unit (e.g., "5 mm")
-        unit_match = re.match(r'(\d+(?:\.\d+)?)\s*([a-zA-Z]+)', text)
+        unit_match = _NUMBER_UNIT_RE.match(text)
         
         if unit_match:
             val, unit = unit_match.groups()
@@ -233,6 +285,12 @@ class QualitativeAttributeExtractor(AttributeExtractor):
             "and", "or", "to", "through", "with", "without"
         ]
         super().__init__(name)
+        # Every match contains at least one value word, so when all of them are
+        # plain literals a substring check can rule text out before the regex runs
+        if all(_REGEX_METACHARACTERS.isdisjoint(word) for word in value_words):
+            self._keywords = tuple(dict.fromkeys(word.casefold() for word in value_words))
+        else:
+            self._keywords = None
     
     def generate_pattern(self) -> str:
         """
@@ -260,6 +318,23 @@ class QualitativeAttributeExtractor(AttributeExtractor):
         
         return r"({})".format(pattern)
     
+    def extract(self, text: str) -> Optional[AttributeNode]:
+        """
+        Extract a qualitative attribute, skipping the regex when no value word occurs.
+        
+        Args:
+            text: The text to extract from.
+            
+        Returns:
+            Attribute node if found, None otherwise.
+        """
+        if self._keywords:
+            folded = text.casefold()
+            if not any(word in folded for word in self._keywords):
+                logger.debug("No value word for attribute %s in text: %s...", self.name, text[:50])
+                return None
+        return super().extract(text)
+    
     def parse_values(self, text: str) -> List[AttributeValue]:
         """
         Parse qualitative descriptions into structured values.
@@ -290,29 +365,29 @@ class QualitativeAttributeExtractor(AttributeExtractor):
 
 
 # Legacy constructor for backward compatibility
-def create_attribute_extractor(name: str, pattern: str) -> AttributeExtractor:
+def create_attribute_extractor(name: str, pattern: Union[str, Pattern]) -> AttributeExtractor:
     """
     Create an attribute extractor with a custom pattern (for backward compatibility).
     
     Args:
         name: The name of the attribute.
-        pattern: The regex pattern to use.
+        pattern: The regex pattern to use, as a string or a compiled pattern.
         
     Returns:
         An AttributeExtractor instance.
     """
     class CustomAttributeExtractor(AttributeExtractor):
-        def generate_pattern(self) -> str:
+        def generate_pattern(self) -> Union[str, Pattern]:
             return pattern
             
         def parse_values(self, text: str) -> List[AttributeValue]:
             values = []
             
             # Handle ranges with dashes (e.g., "8--25 dm")
-            range_match = re.match(r'(\d+(?:\.\d+)?)\s*--\s*(\d+(?:\.\d+)?)\s*([a-zA-Z]+)?', text)
+            range_parts = _parse_range(text)
             
-            if range_match:
-                start_val, end_val, unit = range_match.groups()
+            if range_parts:
+                start_val, end_val, unit = range_parts
                 values.append(AttributeValue(start_val, unit=unit, is_range_start=True))
                 values.append(AttributeValue(end_val, unit=unit, is_range_end=True))
                 return values
@@ -327,7 +402,7 @@ def create_attribute_extractor(name: str, pattern: str) -> AttributeExtractor:
                 return values
                 
             # Handle simple value with unit (e.g., "5 mm")
-            unit_match = re.match(r'(\d+(?:\.\d+)?)\s*([a-zA-Z]+)', text)
+            unit_match = _NUMBER_UNIT_RE.match(text)
             
             if unit_match:
                 val, unit = unit_match.groups()
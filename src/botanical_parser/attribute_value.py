@@ -1,14 +1,25 @@
 """
 Attribute value class representing specific values of botanical attributes.
 """
+from functools import lru_cache
 from typing import Dict, Optional
 
 
 class AttributeValue:
     """
     Represents a specific value for an attribute, with support for ranges, units, etc.
+    
+    Instances are interned: constructing a value equal to a recently constructed one
+    returns the same object, so values must be treated as read-only.
     """
     
+    def __new__(cls, raw_value: str, unit: Optional[str] = None,
+                is_range_start: bool = False, is_range_end: bool = False):
+        return _intern(cls, raw_value, unit, is_range_start, is_range_end)
+    
+    def __getnewargs__(self):
+        return (self.raw_value, self.unit, self.is_range_start, self.is_range_end)
+    
     def __init__(self, raw_value: str, unit: Optional[str] = None, 
                  is_range_start: bool = False, is_range_end: bool = False):
         """
@@ -20,6 +31,9 @@ class AttributeValue:
             is_range_start: Whether this value is the start of a range.
             is_range_end: Whether this value is the end of a range.
         """
+        if 'raw_value' in self.__dict__:
+            # An interned instance handed out before; its fields are already set
+            return
         self.raw_value = raw_value
         self.unit = unit
         self.is_range_start = is_range_start
@@ -29,6 +43,8 @@ class AttributeValue:
         """
         Compare two AttributeValue objects for equality.
         """
+        if self is other:
+            return True
         if not isinstance(other, AttributeValue):
             return NotImplemented
         return (
@@ -71,3 +87,12 @@ class AttributeValue:
             parts.append("is_range_end=True")
             
         return f"AttributeValue({', '.join(parts)})"
+
+
+@lru_cache(maxsize=4096, typed=True)
+def _intern(cls, raw_value, unit, is_range_start, is_range_end):
+    # Descriptions repeat the same few values ("glandular", "5 mm") many times, so
+    # one instance is kept per distinct value. The cache is typed so that equal
+    # arguments of different types (True and 1, 5 and 5.0) get separate instances,
+    # and __init__ leaves an instance's fields alone once they are set.
+    return object.__new__(cls)
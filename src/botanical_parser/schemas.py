@@ -0,0 +1,198 @@
+"""
+Extractor schemas for Jepson-style botanical descriptions.
+
+Attribute extractors with fixed vocabularies are built once at module level and
+shared by every structure that uses them, so each of their patterns is compiled
+a single time no matter how many schemas are built. Each getter builds its
+extractor tree once and returns the same shared instance on every later call.
+"""
+import re
+from functools import lru_cache
+from typing import Pattern
+from .attribute_extractor import NumericAttributeExtractor, QualitativeAttributeExtractor
+from .structure_extractor import StructureExtractor
+
+
+def _section_pattern(header: str) -> Pattern:
+    """
+    Compile a pattern for a top-level section such as "Leaf: ...".
+    
+    Args:
+        header: The section header, without its colon.
+    
+    Returns:
+        Compiled pattern capturing the section text up to the next header.
+    """
+    return re.compile(rf"\b{header}:\s*([^:]*)(?=\s\S+:|$)")
+
+
+# Shared attribute extractors
+_GLANDULARITY_EXTRACTOR = QualitativeAttributeExtractor(
+    "Glandularity", value_words=["glandless", "glandular"], conjunctions=["or"]
+)
+_SURFACE_EXTRACTOR = QualitativeAttributeExtractor(
+    "Surface", value_words=["shaggy-hairy", "hairy", "glabrous"]
+)
+_MARGIN_EXTRACTOR = QualitativeAttributeExtractor(
+    "Margin", value_words=["single-toothed", "double-toothed", "entire"]
+)
+_COLOR_EXTRACTOR = QualitativeAttributeExtractor(
+    "Color", value_words=["pink", "white", "red", "yellow", "green"]
+)
+_LENGTH_EXTRACTOR = NumericAttributeExtractor("Length")
+_WIDTH_EXTRACTOR = NumericAttributeExtractor("Width")
+_COUNT_EXTRACTOR = NumericAttributeExtractor("Count", units=[])
+
+
+@lru_cache(maxsize=1)
+def get_habit_schema() -> StructureExtractor:
+    """
+    Build the extractor for the Habit section.
+    
+    Returns:
+        Structure extractor for Habit.
+    """
+    return StructureExtractor(
+        name="Habit",
+        pattern=_section_pattern("Habit"),
+        attribute_extractors=[
+            QualitativeAttributeExtractor(
+                "Growth Form", value_words=["shrub", "thicket-forming", "tree", "herb"], conjunctions=["or"]
+            ),
+            NumericAttributeExtractor("Height"),
+        ]
+    )
+
+
+@lru_cache(maxsize=1)
+def get_stem_schema() -> StructureExtractor:
+    """
+    Build the extractor for the Stem section.
+    
+    Returns:
+        Structure extractor for Stem.
+    """
+    return StructureExtractor(
+        name="Stem",
+        pattern=_section_pattern("Stem"),
+        child_extractors=[
+            StructureExtractor(
+                name="Prickle",
+                noun="prickles",
+                attribute_extractors=[
+                    QualitativeAttributeExtractor("Count", value_words=["few", "many"], qualifiers=["generally"]),
+                    _LENGTH_EXTRACTOR,
+                    QualitativeAttributeExtractor("Curvature", value_words=["curved", "straight"]),
+                ]
+            )
+        ]
+    )
+
+
+@lru_cache(maxsize=1)
+def get_leaf_schema() -> StructureExtractor:
+    """
+    Build the extractor for the Leaf section.
+    
+    Returns:
+        Structure extractor for Leaf.
+    """
+    return StructureExtractor(
+        name="Leaf",
+        pattern=_section_pattern("Leaf"),
+        child_extractors=[
+            StructureExtractor(
+                name="Axis",
+                noun="axis",
+                attribute_extractors=[_SURFACE_EXTRACTOR, _GLANDULARITY_EXTRACTOR]
+            ),
+            StructureExtractor(
+                name="Leaflet",
+                noun="leaflets",
+                attribute_extractors=[_COUNT_EXTRACTOR, _SURFACE_EXTRACTOR, _GLANDULARITY_EXTRACTOR]
+            ),
+            StructureExtractor(
+                name="Terminal Leaflet",
+                noun="terminal leaflet",
+                attribute_extractors=[_LENGTH_EXTRACTOR, _MARGIN_EXTRACTOR, _GLANDULARITY_EXTRACTOR]
+            ),
+        ]
+    )
+
+
+@lru_cache(maxsize=1)
+def get_flower_schema() -> StructureExtractor:
+    """
+    Build the extractor for the Flower section.
+    
+    Returns:
+        Structure extractor for Flower.
+    """
+    return StructureExtractor(
+        name="Flower",
+        pattern=_section_pattern("Flower"),
+        child_extractors=[
+            StructureExtractor(
+                name="Hypanthium",
+                noun="hypanthium",
+                attribute_extractors=[_WIDTH_EXTRACTOR, _SURFACE_EXTRACTOR, _GLANDULARITY_EXTRACTOR]
+            ),
+            StructureExtractor(
+                name="Sepal",
+                noun="sepals",
+                attribute_extractors=[_GLANDULARITY_EXTRACTOR, _MARGIN_EXTRACTOR]
+            ),
+            StructureExtractor(
+                name="Petal",
+                noun="petals",
+                attribute_extractors=[_LENGTH_EXTRACTOR, _COLOR_EXTRACTOR]
+            ),
+            StructureExtractor(
+                name="Pistil",
+                noun="pistils",
+                attribute_extractors=[_COUNT_EXTRACTOR]
+            ),
+        ]
+    )
+
+
+@lru_cache(maxsize=1)
+def get_fruit_schema() -> StructureExtractor:
+    """
+    Build the extractor for the Fruit section.
+    
+    Returns:
+        Structure extractor for Fruit.
+    """
+    return StructureExtractor(
+        name="Fruit",
+        pattern=_section_pattern("Fruit"),
+        attribute_extractors=[_WIDTH_EXTRACTOR],
+        child_extractors=[
+            StructureExtractor(
+                name="Achene",
+                noun="achenes",
+                attribute_extractors=[_LENGTH_EXTRACTOR]
+            ),
+        ]
+    )
+
+
+@lru_cache(maxsize=1)
+def get_jepson_schema() -> StructureExtractor:
+    """
+    Build the root extractor for a Jepson taxon description.
+    
+    Returns:
+        Root structure extractor with one child per section.
+    """
+    return StructureExtractor(
+        name="TaxonDescription",
+        child_extractors=[
+            get_habit_schema(),
+            get_stem_schema(),
+            get_leaf_schema(),
+            get_flower_schema(),
+            get_fruit_schema(),
+        ]
+    )
@@ -3,7 +3,7 @@ Structure extractor class for extracting botanical structures from descriptions.
 """
 import re
 import logging
-from typing import List, Optional, Dict, Pattern, Tuple
+from typing import Iterator, List, Match, Optional, Dict, Pattern, Tuple, Union
 from .structure_node import StructureNode
 from .attribute_node import AttributeNode
 from .attribute_extractor import AttributeExtractor
@@ -11,6 +11,10 @@ from .attribute_extractor import AttributeExtractor
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# Anchors, word boundaries and lookbehinds can see text outside a region, so
+# patterns using them search a slice of the region instead of pos/endpos
+_POSITION_SENSITIVE_RE = re.compile(r"(?<!\[)\^|\\[AbB]|\(\?<[=!]")
+
 
 class StructureExtractor:
     """
@@ -21,7 +25,7 @@ class StructureExtractor:
     then extracting attributes from the remaining text.
     """
     
-    def __init__(self, name: str, noun: Optional[str] = None, pattern: Optional[str] = None, 
+    def __init__(self, name: str, noun: Optional[str] = None, pattern: Optional[Union[str, Pattern]] = None, 
                  attribute_extractors: Optional[List[AttributeExtractor]] = None,
                  child_extractors: Optional[List['StructureExtractor']] = None):
         """
@@ -32,6 +36,8 @@ class StructureExtractor:
             noun: The noun that starts a region in the text, used to generate the pattern.
             pattern: Regular expression pattern to match the structure's text region.
                      Must include a capturing group for the content.
+                     A compiled pattern is used as-is, with its own flags;
+                     a string is compiled with IGNORECASE and DOTALL.
                      Leave as None to use the noun to generate the pattern;
                      leave both as None to create a root-level extractor.
             attribute_extractors: List of attribute extractors for this structure.
@@ -39,24 +45,51 @@ class StructureExtractor:
         """
         self.name = name
         if noun:
-            self.pattern = re.compile(rf"{noun}\s+(.+?)(?=;|$)", re.IGNORECASE | re.DOTALL)
+            # The region runs to the next semicolon; a negated class scans it in one
+            # pass instead of testing the lookahead after every character
+            self.pattern = re.compile(rf"{noun}\s+(.[^;]*)", re.IGNORECASE | re.DOTALL)
+        elif isinstance(pattern, re.Pattern):
+            self.pattern = pattern
         elif pattern:
             self.pattern = re.compile(pattern, re.IGNORECASE | re.DOTALL)
         else:
             self.pattern = None
         self.attribute_extractors = attribute_extractors or []
         self.child_extractors = child_extractors or []
+        self._slice_regions = bool(self.pattern and _POSITION_SENSITIVE_RE.search(self.pattern.pattern))
+    
+    def _finditer(self, text: str, pos: int, endpos: int) -> Tuple[Iterator[Match], int]:
+        """
+        Find matches of this extractor's pattern within text[pos:endpos].
+        
+        Args:
+            text: The full text.
+            pos: Start of the region to search.
+            endpos: End of the region to search.
+            
+        Returns:
+            Tuple of a match iterator and the offset to add to match positions
+            to get positions in text.
+        """
+        if self._slice_regions:
+            return self.pattern.finditer(text[pos:endpos]), pos
+        return self.pattern.finditer(text, pos, endpos), 0
     
-    def extract(self, text: str) -> Optional[StructureNode]:
+    def extract(self, text: str, pos: int = 0, endpos: Optional[int] = None) -> Optional[StructureNode]:
         """
         Extract a structure node and all its components from text.
         
         Args:
             text: The text to extract from.
+            pos: Start of the region of text to extract from.
+            endpos: End of the region of text to extract from; defaults to the end of text.
             
         Returns:
             Structure node if found, None otherwise.
         """
+        if endpos is None:
+            endpos = len(text)
+            
         # Special case for root-level extractor (no pattern)
         if not self.pattern:
             logger.debug(f"Processing root level extractor {self.name}")
@@ -64,7 +97,7 @@ class StructureExtractor:
             
             # Extract all child structures
             for child_extractor in self.child_extractors:
-                child_node = child_extractor.extract(text)
+                child_node = child_extractor.extract(text, pos, endpos)
                 if child_node:
                     logger.debug(f"Adding child {child_node.name} to root {self.name}")
                     root_node.add_child(child_node)
@@ -72,14 +105,21 @@ class StructureExtractor:
             return root_node
         
         # Regular structure extractor with pattern
-        structure_match = self.pattern.search(text)
+        matches, offset = self._finditer(text, pos, endpos)
+        structure_match = next(matches, None)
         
         if not structure_match:
-            logger.debug(f"No match found for structure {self.name} in text: {text[:50]}...")
+            logger.debug(f"No match found for structure {self.name} in text: {text[pos:pos + 50]}...")
             return None
             
         # Create structure node and extract matched content
-        structure_text = structure_match.group(1) if structure_match.lastindex else ""
+        if structure_match.lastindex:
+            start, end = structure_match.span(1)
+            start += offset
+            end += offset
+        else:
+            start = end = pos
+        structure_text = text[start:end]
         
         if not structure_text.strip():
             logger.debug(f"Empty content for structure {self.name}")
@@ -88,17 +128,27 @@ class StructureExtractor:
         logger.debug(f"Found content for structure {self.name}: {structure_text[:50]}...")
         structure_node = StructureNode(self.name)
         
-        # Extract child structures first
-        remaining_text = structure_text
-        child_regions = self._extract_child_regions(structure_text)
-        
-        for region in child_regions:
-            child_node = region['extractor'].extract(region['text'])
+        # Extract child structures first, searching the content region in place
+        child_spans = []
+        for region in self._extract_child_regions(text, start, end):
+            child_node = region['extractor'].extract(text, region['start'], region['end'])
             if child_node:
                 logger.debug(f"Adding child {child_node.name} to {self.name}")
                 structure_node.add_child(child_node)
-                # Remove the matched text from remaining_text to avoid double parsing
-                remaining_text = remaining_text.replace(region['text'], ' ' * len(region['text']))
+                child_spans.append((region['start'], region['end']))
+        
+        # Blank out the child regions to avoid double parsing
+        remaining_text = structure_text
+        if child_spans:
+            pieces = []
+            cursor = start
+            # Regions are sorted and no longer overlap
+            for child_start, child_end in child_spans:
+                pieces.append(text[cursor:child_start])
+                pieces.append(' ' * (child_end - child_start))
+                cursor = child_end
+            pieces.append(text[cursor:end])
+            remaining_text = ''.join(pieces)
         
         # Extract attributes from remaining text
         for attr_extractor in self.attribute_extractors:
@@ -109,32 +159,37 @@ class StructureExtractor:
                 
         return structure_node
     
-    def _extract_child_regions(self, text: str) -> List[Dict]:
+    def _extract_child_regions(self, text: str, pos: int = 0, endpos: Optional[int] = None) -> List[Dict]:
         """
         Find regions of text that match child structure extractors.
         
         Args:
             text: The text to analyze.
+            pos: Start of the region of text to analyze.
+            endpos: End of the region of text to analyze; defaults to the end of text.
             
         Returns:
-            List of dictionaries containing extractor, text, and span information.
+            List of dictionaries containing extractor and span information,
+            with spans as positions in text.
         """
+        if endpos is None:
+            endpos = len(text)
         regions = []
         
         for extractor in self.child_extractors:
             if not extractor.pattern:
                 continue
                 
-            for match in extractor.pattern.finditer(text):
+            matches, offset = extractor._finditer(text, pos, endpos)
+            for match in matches:
                 if not match.lastindex:
                     continue
                     
                 start, end = match.span(0)  # Use full match span
                 regions.append({
                     'extractor': extractor,
-                    'text': text[start:end],
-                    'start': start,
-                    'end': end
+                    'start': start + offset,
+                    'end': end + offset
                 })
         
         # Sort regions by start position
@@ -144,6 +199,5 @@ class StructureExtractor:
         for i in range(len(regions) - 1):
             if regions[i]['end'] > regions[i + 1]['start']:
                 regions[i]['end'] = regions[i + 1]['start']
-                regions[i]['text'] = text[regions[i]['start']:regions[i]['end']]
                 
         return regions
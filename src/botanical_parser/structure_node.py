@@ -1,10 +1,26 @@
 """
 Structure node class representing botanical structures like Leaf, Stem, etc.
 """
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
 from .botanical_node import BotanicalNode
 
 
+def _index_by_name(nodes: List[BotanicalNode]) -> Tuple[int, Dict[str, List[BotanicalNode]]]:
+    """
+    Group nodes by lowercased name, keeping their order.
+    
+    Args:
+        nodes: The nodes to index.
+        
+    Returns:
+        Tuple of the number of nodes indexed and the index.
+    """
+    index: Dict[str, List[BotanicalNode]] = {}
+    for node in nodes:
+        index.setdefault(node.name.lower(), []).append(node)
+    return len(nodes), index
+
+
 class StructureNode(BotanicalNode):
     """
     Represents a botanical structure (e.g., Leaf, Stem, Flower).
@@ -22,6 +38,10 @@ class StructureNode(BotanicalNode):
         super().__init__(name)
         self.attributes: List['AttributeNode'] = []
         self.children: List['StructureNode'] = []
+        # Name indexes for the find_* methods, built on first use and dropped when
+        # a node is added (or the list length changes through direct appends)
+        self._attribute_index: Optional[Tuple[int, Dict[str, List['AttributeNode']]]] = None
+        self._child_index: Optional[Tuple[int, Dict[str, List['StructureNode']]]] = None
     
     def add_attribute(self, attr: 'AttributeNode') -> None:
         """
@@ -31,6 +51,7 @@ class StructureNode(BotanicalNode):
             attr: The attribute to add.
         """
         self.attributes.append(attr)
+        self._attribute_index = None
     
     def add_child(self, child: 'StructureNode') -> None:
         """
@@ -40,6 +61,7 @@ class StructureNode(BotanicalNode):
             child: The child structure to add.
         """
         self.children.append(child)
+        self._child_index = None
     
     def find_attributes(self, name: str) -> List['AttributeNode']:
         """
@@ -51,7 +73,9 @@ class StructureNode(BotanicalNode):
         Returns:
             List of matching attribute nodes.
         """
-        return [attr for attr in self.attributes if attr.name.lower() == name.lower()]
+        if self._attribute_index is None or self._attribute_index[0] != len(self.attributes):
+            self._attribute_index = _index_by_name(self.attributes)
+        return list(self._attribute_index[1].get(name.lower(), ()))
     
     def find_children(self, name: str) -> List['StructureNode']:
         """
@@ -63,7 +87,9 @@ class StructureNode(BotanicalNode):
         Returns:
             List of matching structure nodes.
         """
-        return [child for child in self.children if child.name.lower() == name.lower()]
+        if self._child_index is None or self._child_index[0] != len(self.children):
+            self._child_index = _index_by_name(self.children)
+        return list(self._child_index[1].get(name.lower(), ()))
     
     def to_dict(self) -> Dict:
         """
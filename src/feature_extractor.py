@@ -1,5 +1,7 @@
 import re
+import sys
 import logging
+from functools import lru_cache
 from src.feature_node import FeatureNode
 from src.feature_value import FeatureValue, split_feature_values
 from typing import List
@@ -7,94 +9,343 @@ from typing import List
 # Configure logging in the test or main
 logger = logging.getLogger(__name__)
 
+# Numbered or named backreferences, which would point at the wrong group once
+# a pattern is embedded in a larger alternation
+_BACKREFERENCE_RE = re.compile(r"\\[1-9]|\(\?P=")
+
+# Constructs whose result can depend on text outside the searched region: anchors
+# (other than a negated "[^"), word boundaries and lookbehinds. Slicing the region
+# out and searching with pos/endpos can disagree for patterns that use them.
+_POSITION_SENSITIVE_RE = re.compile(r"(?<!\[)\^|\\[AbB]|\(\?<[=!]")
+
+# Constructs that can see the end of the searched region: "$", "\Z" and lookaheads.
+# Without them (and without position-sensitive constructs), a match found in a
+# region is also exactly what a search of a region ending at the match finds.
+_END_SENSITIVE_RE = re.compile(r"\$|\\Z|\(\?[=!]")
+
+# How a pattern is run over a region of the text
+_SEARCH, _MATCH, _SLICE = range(3)
+
+def _region_strategy(pattern):
+    """
+    Pick how to run pattern over text[pos:endpos] with the same result as searching
+    the slice. Returns (pattern, mode): a simple "^..." pattern is compiled without
+    its anchor and run with match(), which only tries the start of the region;
+    other position-sensitive patterns fall back to searching a slice.
+    """
+    if pattern is None:
+        return None, _SEARCH
+    source = pattern.pattern
+    if (source.startswith('^') and '|' not in source and not pattern.flags & re.MULTILINE
+            and not _POSITION_SENSITIVE_RE.search(source, 1)):
+        try:
+            return re.compile(source[1:], pattern.flags), _MATCH
+        except re.error:
+            pass
+    if _POSITION_SENSITIVE_RE.search(source):
+        return pattern, _SLICE
+    return pattern, _SEARCH
+
+def _search(pattern, mode, text, pos, endpos):
+    """
+    Search text[pos:endpos] and return (match, offset), where adding offset to the
+    match positions gives positions in text.
+    """
+    if mode == _MATCH:
+        return pattern.match(text, pos, endpos), 0
+    if mode == _SLICE:
+        return pattern.search(text[pos:endpos]), pos
+    return pattern.search(text, pos, endpos), 0
+
+_REGEX_METACHARACTERS = frozenset('.^$*+?{}[]\\|()')
+
+def _literal_prefix(pattern):
+    """
+    Return the literal ASCII text every match of pattern must start with, or ''.
+    Stops at the first metacharacter, and drops the last literal character when
+    a quantifier makes it optional. A pattern with an alternation has no prefix,
+    since its first branch is not required, as in _region_strategy.
+    """
+    source = pattern.pattern
+    if pattern.flags & re.VERBOSE or '|' in source:
+        return ''
+    end = 0
+    while end < len(source) and source[end] not in _REGEX_METACHARACTERS:
+        end += 1
+    if end < len(source) and source[end] in '*?{':
+        end -= 1
+    prefix = source[:max(end, 0)]
+    return prefix if prefix.isascii() else ''
+
+@lru_cache(maxsize=1024)
+def _split_values_cached(raw_value):
+    # Descriptions repeat the same captured values ("glandular", "few to many")
+    # across a corpus, so the split is memoized per raw value. Only immutable
+    # (raw_value, qualifier, is_range_start, unit) tuples are cached; each node
+    # gets its own FeatureValue objects built from them.
+    return tuple((v.raw_value, v.qualifier, v.is_range_start, v.unit) for v in split_feature_values(raw_value))
+
+def _range_start(child_info):
+    return child_info[0]
+
 def _clean_value(val):
     return val.rstrip('.').strip()
 
 class FeatureExtractor:
+    __slots__ = ('name', '_pattern', '_children', '_children_re', '_region_pattern', '_region_mode', '_children_mode',
+                 '_children_groups', '_prefix', '_prefix_ignorecase', '_reuses_match',
+                 '_extract')
+
     def __init__(self, name: str, pattern=None, children=None):
-        self.name = name
-        self.pattern = re.compile(pattern, re.IGNORECASE) if isinstance(pattern, str) else pattern
-        self.children = children or []
+        # Every node this extractor creates shares the interned name
+        self.name = sys.intern(name)
+        self._pattern = re.compile(pattern, re.IGNORECASE) if isinstance(pattern, str) else pattern
+        self.children = children
+
+    @property
+    def pattern(self):
+        # Read-only: a parent's children union is compiled from its children's
+        # patterns, so changing a child's pattern would leave the parent stale
+        return self._pattern
+
+    @property
+    def children(self):
+        # A tuple, so the children can't be changed in place behind the derived state;
+        # add children with add_child or replace them all by assigning a new sequence
+        # (children used to be a plain list, so children.append no longer works)
+        return self._children
 
-    def get_match_range(self, text):
+    @children.setter
+    def children(self, children):
+        self._children = tuple(children or ())
+        self._prepare()
+
+    def add_child(self, child: 'FeatureExtractor'):
+        self._children += (child,)
+        self._prepare()
+
+    def _prepare(self):
+        # Everything derived from the pattern and children, rebuilt when the children
+        # are replaced
+        self._children_re = self._compile_children_union()
+        self._region_pattern, self._region_mode = _region_strategy(self.pattern)
+        self._children_re, self._children_mode = _region_strategy(self._children_re)
+        # Union group name -> (child index, index of the child's first group in the
+        # union, or None if the child has no groups), for lastgroup dispatch
+        self._children_groups = {}
+        if self._children_re is not None:
+            index = self._children_re.groupindex
+            for i, child in enumerate(self.children):
+                group = index[f"_c{i}"]
+                self._children_groups[f"_c{i}"] = (i, group + 1 if child.pattern.groups else None)
+        # A pattern that starts with literal text (e.g. "^Stem:" or "prickles\s*") can
+        # be rejected by looking for that text instead of entering the regex engine:
+        # at the start of the region for an anchored pattern, anywhere in it otherwise.
+        # Unanchored case-insensitive patterns get no prefix: finding it anywhere in
+        # the region takes a lowercased copy of the region, and a case-insensitive
+        # literal search is no faster than the pattern's own search.
+        self._prefix = ''
+        self._prefix_ignorecase = False
+        if self._region_pattern is not None:
+            self._prefix_ignorecase = bool(self.pattern.flags & re.IGNORECASE)
+            if self._region_mode == _MATCH or not self._prefix_ignorecase:
+                prefix = _literal_prefix(self._region_pattern)
+                self._prefix = prefix.lower() if self._prefix_ignorecase else prefix
+        # Whether a leaf can take the value of the match that gave its range instead
+        # of searching that range again
+        self._reuses_match = (not self.children and self.pattern is not None and self._region_mode == _SEARCH
+                              and not _END_SENSITIVE_RE.search(self.pattern.pattern))
+        # Whether this is a leaf or an internal node is fixed here, so extract (and a
+        # parent extracting its children) calls the right method without branching
+        self._extract = self._extract_internal_node if self.children else self._extract_leaf_node
+
+    def _compile_children_union(self):
+        # One alternation of all child patterns (a named group per child), so text
+        # that no child matches is rejected in one scan instead of one per child.
+        # None when the children can't be combined safely.
+        if not self.children:
+            return None
+        patterns = [child.pattern for child in self.children]
+        if any(p is None for p in patterns) or len({p.flags for p in patterns}) != 1:
+            return None
+        if any(_BACKREFERENCE_RE.search(p.pattern) for p in patterns):
+            return None
+        union = "|".join(f"(?P<_c{i}>{p.pattern})" for i, p in enumerate(patterns))
+        try:
+            return re.compile(union, patterns[0].flags)
+        except re.error:
+            return None
+
+    def _search_region(self, text, pos, endpos):
+        # _search for this extractor's own pattern, with the literal prefix check in front
+        prefix = self._prefix
+        if prefix:
+            if self._region_mode != _MATCH:
+                # Only case-sensitive patterns have a prefix here
+                if text.find(prefix, pos, endpos) < 0:
+                    return None, 0
+            elif not self._prefix_ignorecase:
+                if not text.startswith(prefix, pos, endpos):
+                    return None, 0
+            else:
+                head = text[pos:pos + len(prefix)]
+                # Non-ASCII text can still match case-insensitively (e.g. the Kelvin
+                # sign matches "k"), so only ASCII text is rejected here
+                if len(head) < len(prefix) or pos + len(prefix) > endpos or (head.isascii() and head.lower() != prefix):
+                    return None, 0
+        return _search(self._region_pattern, self._region_mode, text, pos, endpos)
+
+    def _match_range(self, text, pos, endpos):
+        # (start, end, value) of this extractor's own match in the region, where value
+        # is the stripped first group, or None if there is no match or the group is empty
+        m, offset = self._search_region(text, pos, endpos)
+        if m and m.lastindex:
+            value = m.group(1).strip()
+            if value:
+                return m.start(0) + offset, m.end(0) + offset, value
+        return None
+
+    def _child_ranges(self, text, pos, endpos):
+        # Match ranges of the children in the region, as (start, end, child, value)
+        # tuples in the children's order, where value is the child's captured value
+        # (None for children without a pattern); None when the union scan shows no
+        # child can match. The union's first match is the earliest child match, and
+        # it is exactly what that child's own search would find, so lastgroup
+        # dispatches it without searching that child again.
+        first = None
+        if self._children_re is not None:
+            m, offset = _search(self._children_re, self._children_mode, text, pos, endpos)
+            if not m:
+                return None
+            if self._children_mode == _SEARCH:
+                # No child pattern is position sensitive, so every child is searched
+                # the way the union was
+                i, group = self._children_groups[m.lastgroup]
+                value = m.group(group) if group is not None else None
+                value = value.strip() if value else None
+                first = i, ((m.start(), m.end(), value) if value else None)
+        child_ranges = []
+        for i, child in enumerate(self.children):
+            if first is not None and i == first[0]:
+                match_range = first[1]
+            elif child.pattern is not None:
+                match_range = child._match_range(text, pos, endpos)
+            else:
+                start, end = child.get_match_range(text, pos, endpos)
+                match_range = (start, end, None) if start != -1 else None
+            if match_range is not None:
+                child_ranges.append((*match_range[:2], child, match_range[2]))
+        return child_ranges
+
+    def get_match_range(self, text, pos=0, endpos=None):
+        # Ranges are positions in text; pos/endpos restrict the search to a region of it
+        if endpos is None:
+            endpos = len(text)
         if self.pattern is not None:
-            m = self.pattern.search(text)
-            if m and m.lastindex and m.group(1).strip():
-                start, end = m.start(0), m.end(0)
-                logger.debug(f"get_match_range: {self.name} found match at ({start}, {end}) in {repr(text)}")
+            match_range = self._match_range(text, pos, endpos)
+            if match_range is not None:
+                start, end, _ = match_range
+                logger.debug("get_match_range: %s found match at (%d, %d)", self.name, start, end)
                 return (start, end)
             else:
-                logger.debug(f"get_match_range: {self.name} no match or empty group in {repr(text)}")
+                logger.debug("get_match_range: %s no match or empty group in region (%d, %d)", self.name, pos, endpos)
                 return (-1, -1)
         elif self.children:
-            child_ranges = [child.get_match_range(text) for child in self.children]
-            valid = [r for r in child_ranges if r[0] != -1]
+            valid = self._child_ranges(text, pos, endpos)
             if not valid:
-                logger.debug(f"get_match_range: {self.name} no children matched in {repr(text)}")
+                logger.debug("get_match_range: %s no children matched in region (%d, %d)", self.name, pos, endpos)
                 return (-1, -1)
             start = min(r[0] for r in valid)
             end = max(r[1] for r in valid)
-            logger.debug(f"get_match_range: {self.name} container range ({start}, {end}) in {repr(text)}")
+            logger.debug("get_match_range: %s container range (%d, %d)", self.name, start, end)
             return (start, end)
         else:
-            logger.debug(f"get_match_range: {self.name} no pattern, no children in {repr(text)}")
+            logger.debug("get_match_range: %s no pattern, no children", self.name)
             return (-1, -1)
 
-    def extract(self, text):
-        logger.debug(f"Entering extract: name={self.name}, pattern={getattr(self.pattern, 'pattern', None)}, text={repr(text)}")
+    def extract(self, text, pos=0, endpos=None):
+        # Only text[pos:endpos] is extracted from; passing the region's bounds
+        # instead of a slice avoids copying it at every level of the hierarchy
+        if endpos is None:
+            endpos = len(text)
+        logger.debug("Entering extract: name=%s, pattern=%s, region=(%d, %d)", self.name, getattr(self.pattern, 'pattern', None), pos, endpos)
+        return self._extract(text, pos, endpos)
+
+    def extract_matched(self, text, pos=0, endpos=None):
+        # Like extract, but only once this extractor's own pattern matches in the region
+        # (extracting an internal node otherwise only runs its children). The pattern
+        # is searched once: a leaf takes its value from that match, and an internal
+        # node extracts its children from the match start to the end of the region.
+        if endpos is None:
+            endpos = len(text)
+        if self.pattern is None:
+            return self._extract(text, pos, endpos)
+        match_range = self._match_range(text, pos, endpos)
+        if match_range is None:
+            logger.debug("extract_matched: %s no match or empty group in region (%d, %d)", self.name, pos, endpos)
+            return None
+        start, _, value = match_range
         if not self.children:
-            return self._extract_leaf_node(text)
-        else:
-            return self._extract_internal_node(text)
+            return self._leaf_node(value)
+        return self._extract_internal_node(text, start, endpos)
 
-    def _extract_leaf_node(self, text):
+    def _extract_leaf_node(self, text, pos=0, endpos=None):
+        if endpos is None:
+            endpos = len(text)
         if self.pattern is not None:
-            m = self.pattern.search(text)
-            logger.debug(f"Leaf node {self.name}: pattern match={bool(m)}")
-            if m and m.lastindex and m.group(1).strip():
-                raw_value = m.group(1).strip()
-                logger.debug(f"Leaf node {self.name}: captured group value={repr(raw_value)}")
-
-                values = split_feature_values(raw_value)
-                return FeatureNode(self.name, values=values)
+            m, _ = self._search_region(text, pos, endpos)
+            logger.debug("Leaf node %s: pattern match=%s", self.name, m is not None)
+            # Strip the captured value once and test the stripped result
+            raw_value = m.group(1).strip() if m and m.lastindex else ''
+            if raw_value:
+                return self._leaf_node(raw_value)
             else:
-                logger.debug(f"Leaf node {self.name}: no match or empty group, skipping node")
+                logger.debug("Leaf node %s: no match or empty group, skipping node", self.name)
                 return None
         else:
-            logger.debug(f"Leaf node {self.name}: no pattern, skipping node")
+            logger.debug("Leaf node %s: no pattern, skipping node", self.name)
             return None
 
-    def _extract_internal_node(self, text):
-        # Get match ranges for all children
-        child_infos = []
-        for child in self.children:
-            start, end = child.get_match_range(text)
-            if start != -1:
-                child_infos.append({'child': child, 'start': start, 'end': end})
+    def _leaf_node(self, raw_value):
+        logger.debug("Leaf node %s: captured group value=%r", self.name, raw_value)
+        values = [FeatureValue(*fields) for fields in _split_values_cached(raw_value)]
+        return FeatureNode(self.name, values=values)
+
+    def _extract_internal_node(self, text, pos=0, endpos=None):
+        if endpos is None:
+            endpos = len(text)
+        # Get match ranges for all children, as (start, end, child, value) tuples
+        child_infos = self._child_ranges(text, pos, endpos)
         if not child_infos:
-            logger.debug(f"No children matched for {self.name}; returning None")
+            logger.debug("No children matched for %s; returning None", self.name)
             return None
-        # Sort by start
-        child_infos.sort(key=lambda x: x['start'])
-        # Truncate ends at next start
-        for i in range(len(child_infos) - 1):
-            child_infos[i]['end'] = min(child_infos[i]['end'], child_infos[i+1]['start'])
+        # Sort by start (stable, so ties keep the children's order)
+        child_infos.sort(key=_range_start)
         # Extract children
         nodes = []
-        for info in child_infos:
-            # Pass the full matched substring (including the label) to the child
-            child_text = text[info['start']:info['end']]
-            logger.debug(f"Passing region to child '{info['child'].name}': {repr(child_text)}")
-            child_node = info['child'].extract(child_text)
+        last = len(child_infos) - 1
+        for i, (start, end, child, value) in enumerate(child_infos):
+            # Truncate the end at the next child's start
+            truncated = i < last and child_infos[i + 1][0] < end
+            if truncated:
+                end = child_infos[i + 1][0]
+            if child._reuses_match and not truncated:
+                # Searching the whole match range again would find the same match
+                logger.debug("Reusing match (%d, %d) for child '%s'", start, end, child.name)
+                child_node = child._leaf_node(value)
+            else:
+                # Pass the full matched region (including the label) to the child
+                logger.debug("Passing region (%d, %d) to child '%s'", start, end, child.name)
+                child_node = child._extract(text, start, end)
             if child_node:
-                logger.debug(f"Child node created: {child_node.name} (value={getattr(child_node, 'value', None)})")
+                logger.debug("Child node created: %s (value=%s)", child_node.name, child_node.value)
                 nodes.append(child_node)
         if nodes:
             node = FeatureNode(self.name)
             for n in nodes:
                 node.add_child(n)
-            logger.debug(f"Created node: {node.name} with {len(nodes)} children")
+            logger.debug("Created node: %s with %d children", node.name, len(nodes))
             return node
         else:
-            logger.debug(f"No children nodes created for {self.name}; returning None")
+            logger.debug("No children nodes created for %s; returning None", self.name)
             return None
@@ -1,12 +1,30 @@
-from typing import List, Optional, Dict
+import sys
+from typing import Iterator, List, Optional, Dict, Tuple
 from src.feature_value import FeatureValue
 
 class FeatureNode:
+    # Descriptions produce many nodes, so they don't carry a per-instance __dict__
+    __slots__ = ('_name', '_name_lower', 'values', 'children', '_by_name')
+
     def __init__(self, name: str, values: Optional[List[FeatureValue]] = None):
         self.name = name
         # List of FeatureValue objects, capturing all values for this feature
         self.values: List[FeatureValue] = values if values is not None else []
         self.children: List['FeatureNode'] = []
+        # (number of children indexed, first child per name), built on first get_child
+        self._by_name: Optional[Tuple[int, Dict[str, 'FeatureNode']]] = None
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    @name.setter
+    def name(self, name: str):
+        # Interned, like the lowercased name, so comparing names of nodes built from
+        # the same extractor is an identity check
+        self._name = sys.intern(name)
+        # Lowercased once here so find doesn't lower every node name on every query
+        self._name_lower = sys.intern(name.lower())
 
     @property
     def value(self) -> Optional[str]:
@@ -17,22 +35,53 @@ class FeatureNode:
 
     def add_child(self, child: 'FeatureNode'):
         self.children.append(child)
+        self._by_name = None
+
+    def get_child(self, name: str) -> Optional['FeatureNode']:
+        """Return the first direct child with exactly the given name, or None."""
+        # Rebuilt if children were appended to the list directly
+        if self._by_name is None or self._by_name[0] != len(self.children):
+            by_name = {}
+            for child in self.children:
+                by_name.setdefault(child.name, child)
+            self._by_name = (len(self.children), by_name)
+        return self._by_name[1].get(name)
+
+    def iter_find(self, name: str) -> Iterator['FeatureNode']:
+        """Lazily yield nodes with the given name in this subtree, in pre-order."""
+        target = sys.intern(name.lower())
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            if node._name_lower == target:
+                yield node
+            # Reversed so children are visited in order, as the recursive walk did
+            stack.extend(reversed(node.children))
 
     def find(self, name: str) -> List['FeatureNode']:
-        """Recursively find all nodes with the given name."""
-        result = []
-        if self.name.lower() == name.lower():
-            result.append(self)
-        for child in self.children:
-            result.extend(child.find(name))
-        return result
+        """Find all nodes with the given name in this subtree, in pre-order."""
+        return list(self.iter_find(name))
 
-    def to_dict(self) -> Dict:
+    def _shallow_dict(self) -> Dict:
         return {
             'name': self.name,
-            'values': [vars(v) for v in self.values],
-            'children': [c.to_dict() for c in self.children]
+            'values': [v.to_dict() for v in self.values],
+            'children': []
         }
 
+    def to_dict(self) -> Dict:
+        # Iterative: each child's dict is appended to its parent's 'children'
+        # list in order before the child itself is expanded
+        root = self._shallow_dict()
+        stack = [(self, root)]
+        while stack:
+            node, node_dict = stack.pop()
+            children = node_dict['children']
+            for child in node.children:
+                child_dict = child._shallow_dict()
+                children.append(child_dict)
+                stack.append((child, child_dict))
+        return root
+
     def __repr__(self):
         return f"FeatureNode(name={self.name!r}, values={self.values!r}, children={self.children!r})"
@@ -1,25 +1,38 @@
+import re
+from functools import lru_cache
+
 from src.feature_extractor import FeatureExtractor
 
+# Numeric range patterns, compiled once here and passed to the extractors as
+# compiled objects. Flags match what FeatureExtractor uses for string patterns.
+RANGE_WITH_UNIT_RE = re.compile(r'(\d+--\d+ ?[a-zA-Z]+)', re.IGNORECASE)
+RANGE_MM_RE = re.compile(r'(\d+--\d+ ?mm)', re.IGNORECASE)
+
+# Each getter builds its extractor tree (and compiles its patterns) once and
+# returns the same shared instance on every later call
+
 # Defines the schema for Habit features in Jepson descriptions
 
+@lru_cache(maxsize=1)
 def get_habit_feature_schema():
     return FeatureExtractor(
         'Habit', r'Habit:\s*(.+)', [
             FeatureExtractor('General', None, [
-                FeatureExtractor('Height', r'(\d+--\d+ ?[a-zA-Z]+)'),
+                FeatureExtractor('Height', RANGE_WITH_UNIT_RE),
                 FeatureExtractor('Growth Form', r'((?:shrub|thicket-forming)(?:\sor\sthicket-forming)?)')
             ])
         ])
 
 # Defines the schema for Stem features in Jepson descriptions
 
+@lru_cache(maxsize=1)
 def get_stem_feature_schema():
     return FeatureExtractor(
         'Stem', r'Stem:\s*(.+)', [
             FeatureExtractor('Prickle', r'prickles\s*([^\.]+)', [
                 FeatureExtractor('Count', r'(few[- ]to[- ]many|few|many)'),
                 FeatureExtractor('Grouping', r'(paired[- ]or[- ]not|paired)'),
-                FeatureExtractor('Length', r'(\d+--\d+ ?mm)'),
+                FeatureExtractor('Length', RANGE_MM_RE),
                 FeatureExtractor('Shape', r'(thick-based[- ]and[- ]compressed|thick-based|compressed)'),
                 FeatureExtractor('Curvature', r'(generally[- ]curved[- ]\(straight\)|curved|straight)'),
             ])
@@ -27,6 +40,7 @@ def get_stem_feature_schema():
 
 # Defines the schema for Leaf features in Jepson descriptions
 
+@lru_cache(maxsize=1)
 def get_leaf_feature_schema():
     return FeatureExtractor(
         'Leaf', r'Leaf:\s*(.+)', [
@@ -41,6 +55,7 @@ def get_leaf_feature_schema():
 
 # Defines the root schema for a Jepson taxon description
 
+@lru_cache(maxsize=1)
 def get_jepson_feature_schema():
     return FeatureExtractor(
         'TaxonDescription', None, [
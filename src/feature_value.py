@@ -1,20 +1,37 @@
-from typing import Optional, List
-
 import re
+import sys
 from typing import Optional, List
 
+# A trailing number followed by a unit word, e.g. "15 mm"
+_NUMBER_UNIT_RE = re.compile(r"([\d.]+)\s*([a-zA-Zμ]+)$")
+# A whole part that is a number and a unit, e.g. the "3 mm" of "3 mm--5 mm"
+_NUMBER_WITH_UNIT_RE = re.compile(r"([\d.]+)\s*([a-zA-Zμ]+)")
+# Value delimiters in priority order, each with whether it separates a range
+_DELIMITERS = (('--', True), (' to ', True), (' or ', False), (',', False))
+
 class FeatureValue:
     """
     Represents a value (or a range endpoint) for a feature in a taxonomic description.
     If is_range_start is True, this value is the start of a range that ends at the next value in the list.
     The 'unit' field captures measurement units (e.g., mm, cm, dm) for numeric values, or None for non-numeric values.
     """
+    # One instance per captured value part, so they don't carry a per-instance __dict__
+    __slots__ = ('raw_value', 'qualifier', 'is_range_start', 'unit')
+
     def __init__(self, raw_value: str, qualifier: Optional[str] = None, is_range_start: bool = False, unit: Optional[str] = None):
         self.raw_value = raw_value
         self.qualifier = qualifier
         self.is_range_start = is_range_start
         self.unit = unit
 
+    def to_dict(self):
+        return {
+            'raw_value': self.raw_value,
+            'qualifier': self.qualifier,
+            'is_range_start': self.is_range_start,
+            'unit': self.unit
+        }
+
     def __repr__(self):
         return f"FeatureValue(raw_value={self.raw_value!r}, qualifier={self.qualifier!r}, is_range_start={self.is_range_start}, unit={self.unit!r})"
 
@@ -25,38 +42,34 @@ def split_feature_values(raw_value: str) -> List[FeatureValue]:
     For non-numeric values, unit is None.
     """
     values = []
-    delimiters = [('--', True), (' to ', True), (' or ', False), (',', False)]
-    splits = [(d, is_range) for d, is_range in delimiters if d in raw_value]
-    if splits:
-        delim, is_range = splits[0]
+    # Only the first delimiter found, in priority order, is split on
+    delim, is_range = next(((d, r) for d, r in _DELIMITERS if d in raw_value), (None, False))
+    if delim is not None:
         parts = [p.strip() for p in raw_value.split(delim)]
         # Try to extract unit from the last part
         unit = None
-        unit_match = re.search(r"([\d.]+)\s*([a-zA-Zμ]+)$", parts[-1])
+        unit_match = _NUMBER_UNIT_RE.search(parts[-1])
         if unit_match:
-            unit = unit_match.group(2)
+            # Only a handful of distinct units occur, so every value shares one copy
+            unit = sys.intern(unit_match.group(2))
         for i, part in enumerate(parts):
             # Remove unit from the number if present (for start of range)
-            if unit and re.match(r"^[\d.]+\s*" + re.escape(unit) + r"$", part):
-                num = re.match(r"^[\d.]+", part).group(0)
-                part_clean = num
+            number_match = _NUMBER_WITH_UNIT_RE.fullmatch(part) if unit else None
+            if number_match and number_match.group(2) == unit:
+                part_clean = number_match.group(1)
             else:
                 part_clean = part
-            values.append(FeatureValue(
-                raw_value=part_clean,
-                qualifier=None,
-                is_range_start=(is_range and i == 0),
-                unit=unit
-            ))
+            # Positional arguments: (raw_value, qualifier, is_range_start, unit)
+            values.append(FeatureValue(part_clean, None, is_range and i == 0, unit))
     else:
         # Try to extract unit if present
         unit = None
-        unit_match = re.search(r"([\d.]+)\s*([a-zA-Zμ]+)$", raw_value)
+        unit_match = _NUMBER_UNIT_RE.search(raw_value)
         if unit_match:
-            unit = unit_match.group(2)
+            unit = sys.intern(unit_match.group(2))
             num = unit_match.group(1)
             raw_val_clean = num
         else:
             raw_val_clean = raw_value
-        values.append(FeatureValue(raw_value=raw_val_clean, qualifier=None, is_range_start=False, unit=unit))
+        values.append(FeatureValue(raw_val_clean, None, False, unit))
     return values
@@ -1,38 +1,47 @@
 """
 Modular grammar components for botanical value parsing.
 """
-from typing import List, Optional, Dict
+from functools import lru_cache
+from typing import Optional, Dict, Sequence, Tuple
 from nltk.grammar import Nonterminal
 from src.flora_cfg.grammar.core import GrammarBuilder, CFG
 
 # Common botanical terms
-GROWTH_FORMS = ["herb", "shrub", "tree", "vine", "subshrub", "annual", "perennial"]
+GROWTH_FORMS = ("herb", "shrub", "tree", "vine", "subshrub", "annual", "perennial")
 
-SURFACE_TERMS = [
+SURFACE_TERMS = (
     "glabrous", "hairy", "pubescent", "tomentose", "hirsute", "pilose", 
     "villous", "scabrous", "glandular", "smooth", "rough"
-]
+)
 
-ADJACENT_QUALIFIERS = [
+ADJACENT_QUALIFIERS = (
     "sparsely", "densely", "finely", "coarsely", "slightly", "heavily", 
     "minutely", "distinctly", "moderately", "strongly"
-]
+)
 
-COLLECTIVE_QUALIFIERS = [
+COLLECTIVE_QUALIFIERS = (
     "generally", "usually", "sometimes", "rarely", "often", "mostly", 
     "occasionally", "typically", "mainly", "predominantly"
-]
+)
 
-UNITS = ["mm", "cm", "m", "dm"]
+UNITS = ("mm", "cm", "m", "dm")
 
-CONJUNCTIONS = ["and", "or", "to", "--"]
+CONJUNCTIONS = ("and", "or", "to", "--")
+
+# Placeholder terminal that stands for any number when the tokenizer
+# classifies numbers itself instead of the grammar listing them one by one
+NUMBER_TOKEN = "<NUMBER>"
+
+# Number of rules add_value_grammar adds besides its number and vocabulary
+# terminal rules, used to pre-size the builder
+_STRUCTURAL_RULES = 25
 
 def add_number_grammar(
     builder: GrammarBuilder, 
     number: Nonterminal,
     simple_value: Nonterminal,
     value: Nonterminal,
-    max_number: int = 100
+    max_number: Optional[int] = 100
 ) -> GrammarBuilder:
     """
     Add grammar rules for numeric values.
@@ -42,20 +51,23 @@ def add_number_grammar(
         number: Nonterminal for number symbols
         simple_value: Nonterminal for simple values
         value: Nonterminal for values
-        max_number: The maximum number to include
+        max_number: The maximum number to include, or None for a single
+            NUMBER_TOKEN rule that matches any pre-classified number
         
     Returns:
         The updated grammar builder
     """
     # Add number terminals
-    for i in range(1, max_number + 1):
-        builder.add_terminal_rule(number, str(i))
+    if max_number is None:
+        builder.add_terminal_rule(number, NUMBER_TOKEN)
+    else:
+        builder.add_values_bulk(number, map(str, range(1, max_number + 1)))
     
     # Register numbers as simple values
-    builder.add_rule(simple_value, [number])
+    builder.add_rule(simple_value, (number,))
     
     # Make them valid values
-    builder.add_rule(value, [simple_value])
+    builder.add_rule(value, (simple_value,))
     
     return builder
 
@@ -65,8 +77,8 @@ def add_basic_terms_grammar(
     surface: Nonterminal,
     simple_value: Nonterminal,
     value: Nonterminal,
-    growth_forms: Optional[List[str]] = None,
-    surface_terms: Optional[List[str]] = None
+    growth_forms: Optional[Sequence[str]] = None,
+    surface_terms: Optional[Sequence[str]] = None
 ) -> GrammarBuilder:
     """
     Add grammar rules for basic botanical terms.
@@ -84,19 +96,21 @@ def add_basic_terms_grammar(
         The updated grammar builder
     """
     # Use provided lists or defaults
-    growth_forms = growth_forms or GROWTH_FORMS
-    surface_terms = surface_terms or SURFACE_TERMS
+    if growth_forms is None:
+        growth_forms = GROWTH_FORMS
+    if surface_terms is None:
+        surface_terms = SURFACE_TERMS
     
     # Add basic terms
     builder.add_values(growth_form, growth_forms)
     builder.add_values(surface, surface_terms)
     
     # Register as simple values
-    builder.add_rule(simple_value, [growth_form])
-    builder.add_rule(simple_value, [surface])
+    builder.add_rule(simple_value, (growth_form,))
+    builder.add_rule(simple_value, (surface,))
     
     # Make them valid values
-    builder.add_rule(value, [simple_value])
+    builder.add_rule(value, (simple_value,))
     
     return builder
 
@@ -111,7 +125,7 @@ def add_unit_grammar(
     unit_value: Nonterminal,
     qualified_number: Nonterminal,
     # Optional parameters
-    units: Optional[List[str]] = None
+    units: Optional[Sequence[str]] = None
 ) -> GrammarBuilder:
     """
     Add grammar rules for units of measurement.
@@ -130,18 +144,19 @@ def add_unit_grammar(
         The updated grammar builder
     """
     # Use provided list or default
-    units = units or UNITS
+    if units is None:
+        units = UNITS
     
     # Add unit terms
     builder.add_values(unit, units)
     
     # Add unit expressions
-    builder.add_rule(unit_value, [number, unit])
-    builder.add_rule(unit_value, [qualified_number, unit])
-    builder.add_rule(qualified_number, [adj_qualifier, number])
+    builder.add_rule(unit_value, (number, unit))
+    builder.add_rule(unit_value, (qualified_number, unit))
+    builder.add_rule(qualified_number, (adj_qualifier, number))
     
     # Make them valid values
-    builder.add_rule(value, [unit_value])
+    builder.add_rule(value, (unit_value,))
     
     return builder
 
@@ -154,7 +169,7 @@ def add_adjacent_qualifier_grammar(
     adj_qualifier: Nonterminal,
     qualified_value: Nonterminal,
     # Optional parameters
-    qualifiers: Optional[List[str]] = None
+    qualifiers: Optional[Sequence[str]] = None
 ) -> GrammarBuilder:
     """
     Add grammar rules for adjacent qualifiers.
@@ -171,16 +186,17 @@ def add_adjacent_qualifier_grammar(
         The updated grammar builder
     """
     # Use provided list or default
-    qualifiers = qualifiers or ADJACENT_QUALIFIERS
+    if qualifiers is None:
+        qualifiers = ADJACENT_QUALIFIERS
     
     # Add qualifier terms
     builder.add_values(adj_qualifier, qualifiers)
     
     # Add qualifier expressions
-    builder.add_rule(qualified_value, [adj_qualifier, simple_value])
+    builder.add_rule(qualified_value, (adj_qualifier, simple_value))
     
     # Make them valid values
-    builder.add_rule(value, [qualified_value])
+    builder.add_rule(value, (qualified_value,))
     
     return builder
 
@@ -192,7 +208,7 @@ def add_collective_qualifier_grammar(
     coll_qualifier: Nonterminal,
     qualified_value: Nonterminal,
     # Optional parameters
-    qualifiers: Optional[List[str]] = None
+    qualifiers: Optional[Sequence[str]] = None
 ) -> GrammarBuilder:
     """
     Add grammar rules for collective qualifiers.
@@ -208,16 +224,20 @@ def add_collective_qualifier_grammar(
         The updated grammar builder
     """
     # Use provided list or default
-    qualifiers = qualifiers or COLLECTIVE_QUALIFIERS
+    if qualifiers is None:
+        qualifiers = COLLECTIVE_QUALIFIERS
     
     # Add qualifier terms
     builder.add_values(coll_qualifier, qualifiers)
     
     # Add qualifier expressions - single level only, no recursion
-    builder.add_rule(qualified_value, [coll_qualifier, value])
+    builder.add_rule(qualified_value, (coll_qualifier, value))
+    
+    # Register qualified value as a value type
+    builder.add_rule(value, (qualified_value,))
     
     # Note: We intentionally do not add a recursive rule like:
-    # builder.add_rule(qualified_value, [coll_qualifier, qualified_value])
+    # builder.add_rule(qualified_value, (coll_qualifier, qualified_value))
     # This would cause infinite recursion during parsing.
     # Instead, we only allow a single collective qualifier per value.
     # Multiple qualifiers can still be handled by the parser through multiple parsing passes.
@@ -234,11 +254,24 @@ def add_conjunction_grammar(
     conjunction: Nonterminal,
     conjunction_value: Nonterminal,
     # Optional parameters
-    conjunctions: Optional[List[str]] = None
+    conjunctions: Optional[Sequence[str]] = None,
+    # Optional nonterminals for qualified conjunctions
+    coll_qualifier: Optional[Nonterminal] = None,
+    unit: Optional[Nonterminal] = None,
+    unit_value: Optional[Nonterminal] = None,
+    qualified_conjunction: Optional[Nonterminal] = None,
+    conjunct: Optional[Nonterminal] = None,
+    coll_qualified_value: Optional[Nonterminal] = None,
+    left_conjunct: Optional[Nonterminal] = None,
+    coll_qualified_unit_value: Optional[Nonterminal] = None
 ) -> GrammarBuilder:
     """
     Add grammar rules for conjunction expressions.
     
+    If coll_qualifier, unit, unit_value and qualified_conjunction are all
+    given, rules for qualified conjunctions (e.g., "generally 5 or 10") and
+    unit application to conjunctions (e.g., "5 or 10 mm") are added as well.
+    
     Args:
         builder: The grammar builder to add rules to
         simple_value: Nonterminal for simple values (dependency)
@@ -247,81 +280,92 @@ def add_conjunction_grammar(
         conjunction: Nonterminal for conjunction symbols
         conjunction_value: Nonterminal for conjunction expressions
         conjunctions: Optional list of conjunction terms
+        coll_qualifier: Optional nonterminal for collective qualifiers (dependency)
+        unit: Optional nonterminal for unit symbols (dependency)
+        unit_value: Optional nonterminal for unit values (dependency)
+        qualified_conjunction: Optional nonterminal for qualified conjunctions
+        conjunct: Optional nonterminal for either side of a conjunction
+            (defaults to CONJUNCT)
+        coll_qualified_value: Optional nonterminal for collective-qualified
+            values (dependency), allowed as the right side of a conjunction
+            (e.g., "herb or generally shrub")
+        left_conjunct: Optional nonterminal for the left side of a conjunction
+            when coll_qualified_value is given (defaults to LEFT_CONJUNCT)
+        coll_qualified_unit_value: Optional nonterminal for a collective
+            qualifier on a unit value as the left side of a conjunction
+            (e.g., "generally 5 mm or 10"; defaults to COLL_QUALIFIED_UNIT_VALUE)
         
     Returns:
         The updated grammar builder
     """
     # Use provided list or default
-    conjunctions = conjunctions or CONJUNCTIONS
+    if conjunctions is None:
+        conjunctions = CONJUNCTIONS
     
     # Add conjunction terms
     builder.add_values(conjunction, conjunctions)
     
-    # Add conjunction expressions (MODIFIED to avoid recursion)
-    builder.add_rule(conjunction_value, [simple_value, conjunction, simple_value])
+    if conjunct is None:
+        conjunct = Nonterminal("CONJUNCT")
     
-    # The following rules were removed to prevent infinite recursion:
-    # builder.add_rule(conjunction_value, [simple_value, conjunction, value])
-    # builder.add_rule(conjunction_value, [value, conjunction, simple_value])
+    # Either side of a conjunction is a simple or a qualified value. Factoring
+    # that choice into CONJUNCT gives one conjunction rule instead of one per
+    # combination of sides, so the parser shares the work for each side.
+    builder.add_rule(conjunct, (simple_value,))
+    builder.add_rule(conjunct, (qualified_value,))
     
-    # Allow qualified values to be combined with simple values in conjunctions
-    builder.add_rule(conjunction_value, [qualified_value, conjunction, simple_value])
-    builder.add_rule(conjunction_value, [simple_value, conjunction, qualified_value])
+    # Conjuncts are not full values, which prevents infinite recursion:
+    # builder.add_rule(conjunction_value, (value, conjunction, value))
+    has_qualified_conjunctions = all(
+        nt is not None for nt in (coll_qualifier, unit, unit_value, qualified_conjunction)
+    )
     
-    # Add specific rule for qualified-qualified conjunctions without introducing recursion
-    builder.add_rule(conjunction_value, [qualified_value, conjunction, qualified_value])
+    if coll_qualified_value is not None:
+        # A collective qualifier at the start of a conjunction scopes over the
+        # whole conjunction (QUALIFIED_CONJUNCTION), so a collective-qualified
+        # left conjunct would make "generally A or B" ambiguous. It is only
+        # needed where the qualified conjunction cannot cover the input: on a
+        # unit value ("generally 5 mm or 10") or on a qualified conjunction
+        # ("generally 5 or 10 -- 20").
+        if left_conjunct is None:
+            left_conjunct = Nonterminal("LEFT_CONJUNCT")
+        builder.add_rule(left_conjunct, (conjunct,))
+        if has_qualified_conjunctions:
+            if coll_qualified_unit_value is None:
+                coll_qualified_unit_value = Nonterminal("COLL_QUALIFIED_UNIT_VALUE")
+            builder.add_rule(coll_qualified_unit_value, (coll_qualifier, unit_value))
+            builder.add_rule(left_conjunct, (coll_qualified_unit_value,))
+            builder.add_rule(left_conjunct, (qualified_conjunction,))
+        
+        builder.add_rule(conjunction_value, (left_conjunct, conjunction, conjunct))
+        builder.add_rule(conjunction_value, (left_conjunct, conjunction, coll_qualified_value))
+    else:
+        builder.add_rule(conjunction_value, (conjunct, conjunction, conjunct))
     
     # Register conjunction value as a value type
-    builder.add_rule(value, [conjunction_value])
-    
-    return builder
-
-def add_qualified_conjunction_grammar(
-    builder: GrammarBuilder,
-    # Required nonterminals (dependencies)
-    value: Nonterminal,
-    coll_qualifier: Nonterminal,
-    conjunction_value: Nonterminal,
-    unit: Nonterminal,
-    unit_value: Nonterminal,
-    # Nonterminals this function creates
-    qualified_conjunction: Nonterminal
-) -> GrammarBuilder:
-    """
-    Add grammar rules for qualified conjunctions.
+    builder.add_rule(value, (conjunction_value,))
     
-    Args:
-        builder: The grammar builder to add rules to
-        value: Nonterminal for values (dependency)
-        coll_qualifier: Nonterminal for collective qualifiers (dependency)
-        conjunction_value: Nonterminal for conjunction expressions (dependency)
-        unit: Nonterminal for unit symbols (dependency)
-        unit_value: Nonterminal for unit values (dependency)
-        qualified_conjunction: Nonterminal for qualified conjunctions
+    if has_qualified_conjunctions:
+        # Add qualified conjunction rules
+        builder.add_rule(qualified_conjunction, (coll_qualifier, conjunction_value))
         
-    Returns:
-        The updated grammar builder
-    """
-    # Add qualified conjunction rules
-    builder.add_rule(qualified_conjunction, [coll_qualifier, conjunction_value])
-    
-    # Register qualified conjunction as a value type
-    builder.add_rule(value, [qualified_conjunction])
-    
-    # Unit application to conjunctions (e.g., "5 or 10 mm")
-    builder.add_rule(unit_value, [conjunction_value, unit])
+        # Register qualified conjunction as a value type
+        builder.add_rule(value, (qualified_conjunction,))
+        
+        # Unit application to conjunctions (e.g., "5 or 10 mm")
+        builder.add_rule(unit_value, (conjunction_value, unit))
     
     return builder
 
 def add_value_grammar(
     builder: GrammarBuilder,
-    growth_forms: Optional[List[str]] = None,
-    surface_terms: Optional[List[str]] = None,
-    adjacent_qualifiers: Optional[List[str]] = None,
-    collective_qualifiers: Optional[List[str]] = None,
-    units: Optional[List[str]] = None,
-    conjunctions: Optional[List[str]] = None,
-    max_number: int = 100
+    growth_forms: Optional[Sequence[str]] = None,
+    surface_terms: Optional[Sequence[str]] = None,
+    adjacent_qualifiers: Optional[Sequence[str]] = None,
+    collective_qualifiers: Optional[Sequence[str]] = None,
+    units: Optional[Sequence[str]] = None,
+    conjunctions: Optional[Sequence[str]] = None,
+    max_number: Optional[int] = 100
 ) -> GrammarBuilder:
     """
     Add all grammar components for botanical value parsing.
@@ -337,7 +381,8 @@ def add_value_grammar(
         collective_qualifiers: Optional list of collective qualifiers
         units: Optional list of measurement units
         conjunctions: Optional list of conjunctions
-        max_number: Maximum number to include
+        max_number: Maximum number to include, or None to match numbers
+            through NUMBER_TOKEN
         
     Returns:
         The updated grammar builder
@@ -354,6 +399,7 @@ def add_value_grammar(
     adj_qualifier = Nonterminal("ADJ_QUALIFIER")
     qualified_value = Nonterminal("QUALIFIED_VALUE")
     coll_qualifier = Nonterminal("COLL_QUALIFIER")
+    coll_qualified_value = Nonterminal("COLL_QUALIFIED_VALUE")
     conjunction = Nonterminal("CONJUNCTION")
     conjunction_value = Nonterminal("CONJUNCTION_VALUE")
     qualified_conjunction = Nonterminal("QUALIFIED_CONJUNCTION")
@@ -378,31 +424,35 @@ def add_value_grammar(
         adjacent_qualifiers
     )
     
+    # Collective qualifiers scope over a whole value, so they get their own
+    # nonterminal; sharing QUALIFIED_VALUE would let them bind to just the
+    # left conjunct and make "generally A to B" ambiguous
     builder = add_collective_qualifier_grammar(
-        builder, value, coll_qualifier, qualified_value, 
+        builder, value, coll_qualifier, coll_qualified_value, 
         collective_qualifiers
     )
     
     builder = add_conjunction_grammar(
         builder, simple_value, value, qualified_value, 
-        conjunction, conjunction_value, conjunctions
-    )
-    
-    builder = add_qualified_conjunction_grammar(
-        builder, value, coll_qualifier, conjunction_value, 
-        unit, unit_value, qualified_conjunction
+        conjunction, conjunction_value, conjunctions,
+        coll_qualifier, unit, unit_value, qualified_conjunction,
+        coll_qualified_value=coll_qualified_value
     )
     
     return builder
 
+def _as_tuple(values: Optional[Sequence[str]]) -> Optional[Tuple[str, ...]]:
+    """Normalize an optional word list to a hashable tuple for caching."""
+    return None if values is None else tuple(values)
+
 def build_jepson_grammar(
-    growth_forms: Optional[List[str]] = None,
-    surface_terms: Optional[List[str]] = None,
-    adjacent_qualifiers: Optional[List[str]] = None,
-    collective_qualifiers: Optional[List[str]] = None,
-    units: Optional[List[str]] = None,
-    conjunctions: Optional[List[str]] = None,
-    max_number: int = 100,
+    growth_forms: Optional[Sequence[str]] = None,
+    surface_terms: Optional[Sequence[str]] = None,
+    adjacent_qualifiers: Optional[Sequence[str]] = None,
+    collective_qualifiers: Optional[Sequence[str]] = None,
+    units: Optional[Sequence[str]] = None,
+    conjunctions: Optional[Sequence[str]] = None,
+    max_number: Optional[int] = 100,
     start_symbol: str = "VALUE"
 ) -> CFG:
     """
@@ -418,17 +468,57 @@ def build_jepson_grammar(
         collective_qualifiers: Optional list of collective qualifiers
         units: Optional list of measurement units
         conjunctions: Optional list of conjunctions
-        max_number: Maximum number to include
+        max_number: Maximum number to include, or None to match numbers
+            through NUMBER_TOKEN
         start_symbol: The start symbol for the grammar
         
     Returns:
-        A context-free grammar for botanical values
+        A context-free grammar for botanical values. Grammars are cached, so
+        repeated calls with the same arguments return the same CFG instance.
     """
+    return _build_jepson_grammar(
+        _as_tuple(growth_forms),
+        _as_tuple(surface_terms),
+        _as_tuple(adjacent_qualifiers),
+        _as_tuple(collective_qualifiers),
+        _as_tuple(units),
+        _as_tuple(conjunctions),
+        max_number,
+        start_symbol
+    )
+
+@lru_cache(maxsize=32)
+def _build_jepson_grammar(
+    growth_forms: Optional[Tuple[str, ...]],
+    surface_terms: Optional[Tuple[str, ...]],
+    adjacent_qualifiers: Optional[Tuple[str, ...]],
+    collective_qualifiers: Optional[Tuple[str, ...]],
+    units: Optional[Tuple[str, ...]],
+    conjunctions: Optional[Tuple[str, ...]],
+    max_number: Optional[int],
+    start_symbol: str
+) -> CFG:
+    """Build a Jepson grammar from hashable arguments; see build_jepson_grammar."""
     # Create the start symbol nonterminal
     start_nt = Nonterminal(start_symbol)
     
-    # Initialize the builder with the start symbol
-    builder = GrammarBuilder(start_symbol=start_nt)
+    # Initialize the builder with the start symbol, pre-sized for the number,
+    # vocabulary and structural rules
+    vocabulary = sum(
+        len(default if words is None else words)
+        for words, default in (
+            (growth_forms, GROWTH_FORMS),
+            (surface_terms, SURFACE_TERMS),
+            (adjacent_qualifiers, ADJACENT_QUALIFIERS),
+            (collective_qualifiers, COLLECTIVE_QUALIFIERS),
+            (units, UNITS),
+            (conjunctions, CONJUNCTIONS),
+        )
+    )
+    builder = GrammarBuilder(
+        start_symbol=start_nt,
+        estimated_rules=(max_number or 1) + vocabulary + _STRUCTURAL_RULES
+    )
     
     # Add all grammar components
     builder = add_value_grammar(
@@ -1,27 +1,112 @@
 """
 Core grammar building components for the Flora CFG parser.
 """
-from typing import List, Union
+import json
+import re
+from typing import Dict, FrozenSet, Iterable, List, Sequence, Tuple, Union
 from nltk.grammar import Nonterminal, Production, CFG
 
+_LARK_INVALID_NAME_CHARS = re.compile(r"[^a-z0-9_]")
+
+
+def _lark_rule_name(nonterminal: Nonterminal) -> str:
+    """
+    Convert a nonterminal to a Lark rule name (lowercase letters, digits and underscores).
+    
+    Args:
+        nonterminal: The nonterminal to convert
+        
+    Returns:
+        The Lark rule name
+    """
+    return _LARK_INVALID_NAME_CHARS.sub("_", str(nonterminal.symbol()).lower())
+
+
+def to_lark_grammar(grammar: CFG) -> str:
+    """
+    Convert a CFG to a Lark grammar definition.
+    
+    Nonterminals become lowercase rules, terminals become string literals, and
+    whitespace between tokens is ignored, so the grammar parses the tokens of a
+    value joined by spaces. Duplicate productions, and productions that can never
+    match because they use a nonterminal without productions, are left out. The
+    grammar may be ambiguous, so it should be used with Lark's Earley parser
+    rather than LALR.
+    
+    Args:
+        grammar: The grammar to convert
+        
+    Returns:
+        Lark grammar text with a "start" rule for the grammar's start symbol
+    """
+    # Alternatives per rule, keyed by their text (which drops duplicate
+    # productions) and mapped to the rules they reference
+    alternatives: Dict[str, Dict[str, FrozenSet[str]]] = {}
+    for production in grammar.productions():
+        items = [
+            _lark_rule_name(item) if isinstance(item, Nonterminal) else json.dumps(item)
+            for item in production.rhs()
+        ]
+        references = frozenset(
+            _lark_rule_name(item) for item in production.rhs() if isinstance(item, Nonterminal)
+        )
+        alternatives.setdefault(_lark_rule_name(production.lhs()), {})[" ".join(items)] = references
+    
+    # Lark rejects references to rules without productions (e.g. an empty unit
+    # vocabulary), so drop alternatives that can never match until none are left
+    changed = True
+    while changed:
+        changed = False
+        for name, rule in list(alternatives.items()):
+            kept = {rhs: references for rhs, references in rule.items() if references.issubset(alternatives)}
+            if len(kept) != len(rule):
+                changed = True
+                if kept:
+                    alternatives[name] = kept
+                else:
+                    del alternatives[name]
+    
+    start = _lark_rule_name(grammar.start())
+    lines = [] if start == "start" else [f"start: {start}"]
+    for name, rhs_list in alternatives.items():
+        lines.append(f"{name}: " + "\n    | ".join(rhs_list))
+    lines.append("%import common.WS")
+    lines.append("%ignore WS")
+    return "\n".join(lines) + "\n"
+
+
 class GrammarBuilder:
     """
     Builder class for constructing context-free grammars programmatically.
     Provides a fluent interface for defining grammar rules.
     """
     
-    def __init__(self, start_symbol: Nonterminal):
+    def __init__(self, start_symbol: Nonterminal, estimated_rules: int = 0):
         """
         Initialize a grammar builder with a start symbol.
         
         Args:
             start_symbol: The starting non-terminal symbol of the grammar
+            estimated_rules: Optional expected number of rules, used to pre-size
+                the production list so it does not have to grow while rules are added
         """
-        self.productions = []
+        # Pre-sized production buffer; only the first _n slots hold productions
+        self._productions = [None] * estimated_rules
+        self._n = 0
         self.nonterminals = {start_symbol.symbol(): start_symbol}
         self.start_symbol = start_symbol
     
-    def add_rule(self, lhs: Nonterminal, rhs: List[Union[str, Nonterminal]]) -> 'GrammarBuilder':
+    @property
+    def productions(self) -> Tuple[Production, ...]:
+        """
+        The productions added so far, in order.
+        
+        Read-only: add productions through the add_* methods, which keep the
+        pre-sized buffer in step.
+        """
+        return tuple(self._productions[:self._n])
+    
+    def add_rule(self, lhs: Nonterminal, rhs: Sequence[Union[str, Nonterminal]]) -> 'GrammarBuilder':
         """
         Add a production rule to the grammar.
         
@@ -32,25 +117,57 @@ class GrammarBuilder:
         Returns:
             Self for method chaining
         """
-        # Register the nonterminal if it's not already known
-        if lhs.symbol() not in self.nonterminals:
-            self.nonterminals[lhs.symbol()] = lhs
-            
-        rhs_items = []
+        # Register the nonterminals if they're not already known
+        register = self.nonterminals.setdefault
+        register(lhs.symbol(), lhs)
         
         for item in rhs:
             if isinstance(item, Nonterminal):
-                # Register the nonterminal if it's not already known
-                if item.symbol() not in self.nonterminals:
-                    self.nonterminals[item.symbol()] = item
-                rhs_items.append(item)
-            else:
-                # Treat other items as terminals
-                rhs_items.append(item)
-        
-        self.productions.append(Production(lhs, rhs_items))
+                register(item.symbol(), item)
+            # Other items are treated as terminals
+        
+        self._append(Production(lhs, rhs))
         return self
     
+    def _append(self, production: Production) -> None:
+        """
+        Store a production, filling pre-sized slots before growing the list.
+        
+        Args:
+            production: The production to store
+        """
+        if self._n < len(self._productions):
+            self._productions[self._n] = production
+        else:
+            self._productions.append(production)
+        self._n += 1
+    
+    def _extend(self, productions: List[Production]) -> None:
+        """
+        Store a batch of productions, filling pre-sized slots before growing the list.
+        
+        Args:
+            productions: The productions to store
+        """
+        end = self._n + len(productions)
+        # Slice assignment overwrites the free slots and grows the list for the rest
+        self._productions[self._n:end] = productions
+        self._n = end
+    
+    def _bulk_add_terminals(self, lhs: Nonterminal, values: Iterable[str]) -> None:
+        """
+        Add one terminal rule per value in a single batch.
+        
+        The values are known to be terminals, so the per-item nonterminal
+        check in add_rule is skipped.
+        
+        Args:
+            lhs: The left-hand side non-terminal
+            values: The terminal values
+        """
+        self.nonterminals.setdefault(lhs.symbol(), lhs)
+        self._extend([Production(lhs, (value,)) for value in values])
+    
     def add_terminal_rule(self, lhs: Nonterminal, terminal: str) -> 'GrammarBuilder':
         """
         Add a rule that produces a terminal symbol.
@@ -62,9 +179,9 @@ class GrammarBuilder:
         Returns:
             Self for method chaining
         """
-        return self.add_rule(lhs, [terminal])
+        return self.add_rule(lhs, (terminal,))
     
-    def add_alternative_rules(self, lhs: Nonterminal, alternatives: List[List[Union[str, Nonterminal]]]) -> 'GrammarBuilder':
+    def add_alternative_rules(self, lhs: Nonterminal, alternatives: List[Sequence[Union[str, Nonterminal]]]) -> 'GrammarBuilder':
         """
         Add multiple alternative production rules for the same LHS.
         
@@ -83,6 +200,9 @@ class GrammarBuilder:
         """
         Add rules for a list of terminal values.
         
+        Duplicate values are skipped, keeping the order of first occurrence,
+        so the grammar never contains the same terminal rule twice.
+        
         Args:
             lhs: The left-hand side non-terminal
             values: List of terminal values
@@ -90,8 +210,25 @@ class GrammarBuilder:
         Returns:
             Self for method chaining
         """
-        for value in values:
-            self.add_terminal_rule(lhs, value)
+        self._bulk_add_terminals(lhs, dict.fromkeys(values))
+        return self
+    
+    def add_values_bulk(self, lhs: Nonterminal, values: Iterable[str]) -> 'GrammarBuilder':
+        """
+        Add rules for terminal values that are already known to be distinct.
+        
+        Unlike add_values, values are not deduplicated and may be any iterable,
+        such as a generator, so large generated vocabularies are added in a
+        single pass without building an intermediate list.
+        
+        Args:
+            lhs: The left-hand side non-terminal
+            values: Iterable of distinct terminal values
+            
+        Returns:
+            Self for method chaining
+        """
+        self._bulk_add_terminals(lhs, values)
         return self
     
     def merge(self, other_builder: 'GrammarBuilder') -> 'GrammarBuilder':
@@ -105,7 +242,7 @@ class GrammarBuilder:
             Self, for method chaining
         """
         # Merge productions
-        self.productions.extend(other_builder.productions)
+        self._extend(other_builder._productions[:other_builder._n])
         
         # Merge nonterminals
         for name, nt in other_builder.nonterminals.items():
@@ -121,4 +258,13 @@ class GrammarBuilder:
         Returns:
             A CFG object
         """
-        return CFG(self.start_symbol, self.productions)
+        return CFG(self.start_symbol, self._productions[:self._n])
+    
+    def build_lark(self) -> str:
+        """
+        Build the grammar as a Lark grammar definition.
+        
+        Returns:
+            Lark grammar text, as produced by to_lark_grammar
+        """
+        return to_lark_grammar(self.build())
@@ -7,6 +7,9 @@ from typing import List, Dict, Optional, Any
 class BotanicalExpression(ABC):
     """Abstract base class for all botanical expressions."""
     
+    # One instance is created per parse-tree node, so none of them carry a __dict__
+    __slots__ = ()
+    
     @abstractmethod
     def to_dict(self) -> Dict[str, Any]:
         """Convert the expression to a dictionary representation."""
@@ -15,6 +18,8 @@ class BotanicalExpression(ABC):
 class ValueExpression(BotanicalExpression):
     """A simple value expression, such as a word or number."""
     
+    __slots__ = ("value", "value_type")
+    
     def __init__(self, value: Any, value_type: str = "word"):
         """
         Initialize a value expression.
@@ -40,6 +45,8 @@ class ValueExpression(BotanicalExpression):
 class QualifierExpression(BotanicalExpression):
     """A qualifier applied to another expression."""
     
+    __slots__ = ("qualifier", "expression", "qualifier_type")
+    
     def __init__(self, qualifier: str, expression: BotanicalExpression, qualifier_type: str = "adjacent"):
         """
         Initialize a qualifier expression.
@@ -68,6 +75,8 @@ class QualifierExpression(BotanicalExpression):
 class ConjunctionExpression(BotanicalExpression):
     """A conjunction of multiple expressions (e.g., "A or B", "X to Y")."""
     
+    __slots__ = ("conjunction", "expressions")
+    
     def __init__(self, conjunction: str, expressions: List[BotanicalExpression]):
         """
         Initialize a conjunction expression.
@@ -94,6 +103,8 @@ class ConjunctionExpression(BotanicalExpression):
 class RangeExpression(BotanicalExpression):
     """A range expression (e.g., "1--5 mm")."""
     
+    __slots__ = ("start", "end", "unit")
+    
     def __init__(self, 
                  start: BotanicalExpression, 
                  end: BotanicalExpression, 
@@ -1,11 +1,14 @@
 """
 Value parser for botanical expressions.
 """
-from typing import List
-from nltk.parse import RecursiveDescentParser
-from nltk.tokenize import word_tokenize
+import re
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from typing import Iterable, List, Optional
+from nltk.grammar import CFG
+from nltk.parse import EarleyChartParser
 
-from src.flora_cfg.grammar.components import build_jepson_grammar
+from src.flora_cfg.grammar.components import NUMBER_TOKEN, build_jepson_grammar
 from src.flora_cfg.models.expression import (
     BotanicalExpression, 
     ValueExpression, 
@@ -14,6 +17,73 @@ from src.flora_cfg.models.expression import (
     RangeExpression
 )
 
+# Range dashes, numbers (with optional decimals), words (with optional
+# internal hyphens) and any other single punctuation character
+_TOKEN_RE = re.compile(r"--|\d+(?:\.\d+)?|[^\W\d_]+(?:-[^\W\d_]+)*|[^\s\w]")
+
+# "-- to" is written in some descriptions and means the same as "--"
+_DASH_TO_RE = re.compile(r"--\s*to\b")
+
+# Qualifier type for each qualifier nonterminal label
+_QUALIFIER_TYPES = {
+    "COLL_QUALIFIER": "collective",
+    "ADJ_QUALIFIER": "adjacent",
+}
+
+# Labels of nodes that only wrap a single other value
+_WRAPPER_LABELS = frozenset(("VALUE", "SIMPLE_VALUE", "CONJUNCT", "LEFT_CONJUNCT"))
+
+@lru_cache(maxsize=8)
+def _get_parser(grammar: CFG) -> EarleyChartParser:
+    """
+    Get a parser for a grammar, reusing it across BotanicalValueParser instances.
+    
+    Args:
+        grammar: The grammar to parse with
+        
+    Returns:
+        A parser for the grammar
+    """
+    return EarleyChartParser(grammar)
+
+@lru_cache(maxsize=None)
+def get_default_parser() -> "BotanicalValueParser":
+    """
+    Get a shared parser for the default Jepson grammar.
+    
+    Callers that parse many values should use this instead of constructing
+    a new BotanicalValueParser for every call.
+    
+    Returns:
+        The shared BotanicalValueParser instance
+    """
+    return BotanicalValueParser()
+
+def _parse_with_default_parser(text: str) -> BotanicalExpression:
+    """Parse one value with the default parser; the worker function for parse_values."""
+    return get_default_parser().parse(text)
+
+def parse_values(texts: Iterable[str], workers: Optional[int] = None) -> List[BotanicalExpression]:
+    """
+    Parse many values with the default parser, spread over worker processes.
+    
+    Parsing is CPU-bound pure Python, so separate processes avoid the GIL.
+    Each worker builds its own default parser once and reuses it.
+    
+    Args:
+        texts: The values to parse
+        workers: Number of worker processes; None uses one per CPU, and 1
+            parses in the calling process without starting a pool
+        
+    Returns:
+        The parsed expressions, in the same order as texts
+    """
+    if workers == 1:
+        return [_parse_with_default_parser(text) for text in texts]
+    
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(_parse_with_default_parser, texts, chunksize=16))
+
 class BotanicalValueParser:
     """Parser for botanical value expressions using context-free grammar."""
     
@@ -24,8 +94,11 @@ class BotanicalValueParser:
         Args:
             custom_grammar: Optional custom grammar to use
         """
-        self.grammar = custom_grammar or build_jepson_grammar()
-        self.parser = RecursiveDescentParser(self.grammar)
+        # The default grammar matches every number through NUMBER_TOKEN
+        # instead of one terminal rule per number
+        self.grammar = custom_grammar or build_jepson_grammar(max_number=None)
+        self.parser = _get_parser(self.grammar)
+        self._numbers_as_token = bool(self.grammar.productions(rhs=NUMBER_TOKEN))
     
     def tokenize(self, text: str) -> List[str]:
         """
@@ -37,28 +110,17 @@ class BotanicalValueParser:
         Returns:
             List of tokens
         """
-        # Preprocess text to handle special tokens
-        text = text.lower()
-        text = text.replace("--", " -- ")
-        
-        # Use NLTK's word_tokenize
-        tokens = word_tokenize(text)
-        
-        # Post-process to handle special cases
-        processed_tokens = []
-        i = 0
-        while i < len(tokens):
-            token = tokens[i]
-            
-            # Handle compound tokens like "to" after "--"
-            if token == "--" and i + 1 < len(tokens) and tokens[i + 1] == "to":
-                processed_tokens.append("--")
-                i += 2
-            else:
-                processed_tokens.append(token)
-                i += 1
+        # Skip the copy for text that is already lowercase
+        if not text.islower():
+            text = text.lower()
+        
+        # Collapse "-- to" into a single range dash before scanning; the
+        # substring probe skips the regex for the many values without dashes
+        if "--" in text:
+            text = _DASH_TO_RE.sub("--", text)
         
-        return processed_tokens
+        # A single regex scan; "--" is its own token via the alternation
+        return _TOKEN_RE.findall(text)
     
     def parse(self, text: str) -> BotanicalExpression:
         """
@@ -76,10 +138,22 @@ class BotanicalValueParser:
         # Tokenize the text
         tokens = self.tokenize(text)
         
-        # Try to parse using the CFG
-        trees = list(self.parser.parse(tokens))
+        # Numbers all look the same to a NUMBER_TOKEN grammar; the
+        # tokenizer only emits numbers that start with a digit
+        if self._numbers_as_token:
+            parse_tokens = [NUMBER_TOKEN if token[:1].isdecimal() else token for token in tokens]
+        else:
+            parse_tokens = tokens
         
-        if not trees:
+        # Try to parse using the CFG; only the first derivation is used
+        tree = next(self.parser.parse(parse_tokens), None)
+        
+        if tree is not None and parse_tokens is not tokens:
+            # Put the original numbers back in place of the placeholders
+            for position, token in zip(tree.treepositions("leaves"), tokens):
+                tree[position] = token
+        
+        if tree is None:
             # If the CFG parsing fails, fall back to a simple value
             if is_number(text):
                 return ValueExpression(float(text), value_type="number")
@@ -87,7 +161,7 @@ class BotanicalValueParser:
                 return ValueExpression(text, value_type="word")
         
         # Convert the parse tree to a BotanicalExpression
-        return self._convert_tree_to_expression(trees[0])
+        return self._convert_tree_to_expression(tree)
     
     def _convert_tree_to_expression(self, tree) -> BotanicalExpression:
         """
@@ -99,6 +173,11 @@ class BotanicalValueParser:
         Returns:
             A BotanicalExpression object
         """
+        # Skip single-child wrapper nodes without recursing
+        while (len(tree) == 1 and tree.label() in _WRAPPER_LABELS
+               and not isinstance(tree[0], str)):
+            tree = tree[0]
+        
         # Extract the production for this node
         node_label = tree.label()
         
@@ -115,16 +194,11 @@ class BotanicalValueParser:
             return ValueExpression(value, value_type="word")
         
         # Handle qualified values
-        if node_label == "QUALIFIED_VALUE":
+        if node_label in ("QUALIFIED_VALUE", "COLL_QUALIFIED_VALUE", "COLL_QUALIFIED_UNIT_VALUE",
+                          "QUALIFIED_CONJUNCTION"):
             if len(tree) == 2:
                 qualifier = tree[0][0]
-                qualifier_type = "adjacent"
-                
-                # Determine qualifier type
-                if tree[0].label() == "COLL_QUALIFIER":
-                    qualifier_type = "collective"
-                elif tree[0].label() == "ADJ_QUALIFIER":
-                    qualifier_type = "adjacent"
+                qualifier_type = _QUALIFIER_TYPES.get(tree[0].label(), "adjacent")
                 
                 expression = self._convert_tree_to_expression(tree[1])
                 return QualifierExpression(qualifier, expression, qualifier_type)
@@ -154,11 +228,6 @@ class BotanicalValueParser:
                 
                 return ConjunctionExpression(conj, [left, right])
         
-        # Handle simple values
-        if node_label == "SIMPLE_VALUE" or node_label == "VALUE":
-            if len(tree) == 1:
-                return self._convert_tree_to_expression(tree[0])
-        
         # Recursively process non-terminal nodes
         for child in tree:
             if not isinstance(child, str):
@@ -177,8 +246,19 @@ def is_number(s: str) -> bool:
     Returns:
         True if the string is a number, False otherwise
     """
+    if isinstance(s, str):
+        return _is_number_str(s)
     try:
         float(s)
         return True
     except (ValueError, TypeError):
         return False
+
+@lru_cache(maxsize=512)
+def _is_number_str(s: str) -> bool:
+    """Check if a string can be converted to a number; cached, as tokens repeat."""
+    try:
+        float(s)
+        return True
+    except ValueError:
+        return False
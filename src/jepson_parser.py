@@ -1,13 +1,70 @@
+import re
+from functools import lru_cache
+from multiprocessing import Pool
+from typing import Iterable, List, Optional, Pattern
+
 from src.feature_extractor import FeatureExtractor
 from src.feature_node import FeatureNode
-import re
-from typing import List, Optional, Dict
+from src.feature_schema import get_jepson_feature_schema
+
+# Jepson section headers the schema has no extractor for. They are still scanned
+# for, since every header ends the section before it.
+UNMODELLED_SECTION_HEADERS = (
+    'Inflorescence', 'Flower', 'Fruit', 'Chromosomes', 'Ecology', 'Bioregional Distribution',
+    'Distribution Outside California', 'Flowering Time',
+)
 
-from src.feature_schema import get_habit_feature_schema, get_stem_feature_schema, get_leaf_feature_schema, get_jepson_feature_schema
+@lru_cache(maxsize=1)
+def _section_header_re(schema: FeatureExtractor) -> Pattern:
+    # The headers of the schema's sections and the unmodelled ones, in one
+    # alternation so a single scan finds where every section starts
+    headers = [child.name for child in schema.children]
+    headers += [h for h in UNMODELLED_SECTION_HEADERS if h not in headers]
+    return re.compile(r'\b(' + '|'.join(map(re.escape, headers)) + r')\s*:', re.IGNORECASE)
+
+def parse_jepson_description(description: str) -> Optional[FeatureNode]:
+    """
+    Parse a Jepson taxon description into a feature tree.
+    The section headers are found in one scan, and each section the schema knows is
+    extracted from its own region, which ends where the next section starts. A
+    section is taken from the first region where its own pattern matches and that
+    yields a node. The extractor hierarchy is cached by get_jepson_feature_schema,
+    so it is built and its patterns compiled only once no matter how many
+    descriptions are parsed.
+    """
+    schema = get_jepson_feature_schema()
+    # Sections that have not produced a node yet, by lowercased header
+    pending = {child.name.lower(): child for child in schema.children}
+    headers = list(_section_header_re(schema).finditer(description))
+    node = FeatureNode(schema.name)
+    for i, m in enumerate(headers):
+        key = m.group(1).lower()
+        extractor = pending.get(key)
+        if extractor is None:
+            continue
+        end = headers[i + 1].start() if i + 1 < len(headers) else len(description)
+        # The header scan is looser than the section's own pattern (e.g. it accepts
+        # "Stem :"), so the section's pattern has to match in the region too
+        child = extractor.extract_matched(description, m.start(), end)
+        if child:
+            node.add_child(child)
+            del pending[key]
+    return node if node.children else None
+
+def parse_jepson_descriptions(descriptions: Iterable[str], workers: Optional[int] = None) -> List[Optional[FeatureNode]]:
+    """
+    Parse many descriptions in parallel worker processes, in input order.
+    Each worker builds the cached schema once and reuses it for its share of the
+    descriptions. workers=None uses one process per CPU; workers=1 parses in the
+    calling process without starting a pool.
+    """
+    if workers == 1:
+        return [parse_jepson_description(d) for d in descriptions]
+    with Pool(workers) as pool:
+        return list(pool.imap(parse_jepson_description, descriptions, chunksize=64))
 
 # Example usage (for testing)
 if __name__ == "__main__":
     desc = '''Habit: shrub or thicket-forming, 8--25 dm. Stem: prickles few to many, paired or not, 3--15 mm, thick-based and compressed, generally curved (straight). Leaf: axis +- shaggy-hairy (+- glabrous), hairs to 1 mm, glandless or glandular; leaflets 5--7(9), +- hairy, sometimes glandular; terminal leaflet generally 15--50 mm, +- ovate-elliptic, generally widest at or below middle, tip rounded to acute, margins single- or double-toothed, glandular or not. Inflorescence: (1)3--30(50)-flowered; pedicels generally +- 5--20 mm, generally +- hairy, glandless. Flower: hypanthium 3--5.5 mm wide at flower, glabrous to sparsely hairy, glandless, neck 2--4.5 mm wide; sepals glandular or not, entire, tip generally +- equal to body, entire; petals generally 15--25 mm, pink; pistils 20--40. Fruit: generally 8--15(20) mm wide, generally (ob)ovoid; sepals generally erect, persistent; achenes generally 3.5--4.5 mm. Chromosomes: n=14.\nEcology: Generally +- moist areas, especially streambanks; Elevation: < 1800 m. Bioregional Distribution: CA-FP (exc CaRH, SNH, Teh); Distribution Outside California: southern Oregon, northern Baja California. Flowering Time: Feb--Nov'''
-    schema = get_jepson_feature_schema()
-    tree = schema.extract(desc)
+    tree = parse_jepson_description(desc)
     print(tree)
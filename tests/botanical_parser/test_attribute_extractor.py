@@ -1,6 +1,7 @@
 """
 Tests for the AttributeExtractor classes.
 """
+import re
 import pytest
 from src.botanical_parser.attribute_extractor import (
     create_attribute_extractor,
@@ -10,6 +11,8 @@ from src.botanical_parser.attribute_extractor import (
 from src.botanical_parser.attribute_node import AttributeNode
 from src.botanical_parser.attribute_value import AttributeValue
 
+WORD_RE = re.compile(r"(\w+)", re.IGNORECASE)
+
 
 def test_attribute_extractor_simple():
     """Test extracting a simple attribute using QualitativeAttributeExtractor."""
@@ -40,6 +43,25 @@ def test_attribute_extractor_no_match():
     assert node is None
 
 
+def test_qualitative_extractor_keyword_prefilter():
+    """Test that literal value words prefilter text without changing matches."""
+    extractor = QualitativeAttributeExtractor(
+        name="Color", 
+        value_words=["green", "yellow"]
+    )
+    assert extractor._keywords == ("green", "yellow")
+    assert extractor.extract("pale blue") is None
+    
+    node = extractor.extract("generally GREEN")
+    assert node is not None
+    assert node.values[0].raw_value == "generally GREEN"
+    
+    # Regex value words disable the prefilter
+    extractor = QualitativeAttributeExtractor(name="Color", value_words=["gr[ae]y"])
+    assert extractor._keywords is None
+    assert extractor.extract("grey").values[0].raw_value == "grey"
+
+
 def test_attribute_extractor_custom():
     """Test behavior with a custom pattern using the legacy constructor."""
     extractor = create_attribute_extractor("Color", r"(\w+)")
@@ -53,6 +75,18 @@ def test_attribute_extractor_custom():
     assert node.values[0].raw_value == "green"
 
 
+def test_attribute_extractor_compiled_pattern():
+    """Test that a compiled custom pattern is used as-is."""
+    extractor = create_attribute_extractor("Color", WORD_RE)
+    assert extractor.pattern is WORD_RE
+    
+    node = extractor.extract("green")
+    
+    assert node is not None
+    assert node.name == "Color"
+    assert [v.raw_value for v in node.values] == ["green"]
+
+
 def test_attribute_extractor_range():
     """Test extracting a range attribute using NumericAttributeExtractor."""
     extractor = NumericAttributeExtractor(
@@ -110,3 +144,17 @@ def test_attribute_extractor_with_unit():
     assert len(node.values) == 1
     assert node.values[0].raw_value == "5"
     assert node.values[0].unit == "mm"
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("1.5--2.5 mm", [AttributeValue("1.5", unit="mm", is_range_start=True),
+                     AttributeValue("2.5", unit="mm", is_range_end=True)]),
+    ("5 -- 30", [AttributeValue("5", is_range_start=True), AttributeValue("30", is_range_end=True)]),
+    ("10(15) cm", [AttributeValue("10", unit="cm"), AttributeValue("15", unit="cm", is_range_end=True)]),
+    ("5.--7 mm", [AttributeValue("5.--7 mm")]),
+])
+def test_numeric_parse_values(text, expected):
+    """Test parsing numeric ranges, parenthetical maxima and non-ranges."""
+    extractor = NumericAttributeExtractor(name="Length")
+    
+    assert extractor.parse_values(text) == expected
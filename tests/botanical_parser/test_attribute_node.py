@@ -1,6 +1,7 @@
 """
 Tests for the AttributeNode and AttributeValue classes.
 """
+import pickle
 import pytest
 from src.botanical_parser.attribute_node import AttributeNode
 from src.botanical_parser.attribute_value import AttributeValue
@@ -98,3 +99,26 @@ def test_attribute_value_to_dict():
     assert value_dict["unit"] == "cm"
     assert value_dict["is_range_start"] is True
     assert value_dict["is_range_end"] is False
+
+
+def test_attribute_value_is_interned():
+    """Test that equal attribute values share one instance."""
+    value = AttributeValue("5", unit="mm", is_range_start=True)
+    
+    assert AttributeValue("5", "mm", True) is value
+    assert AttributeValue("5", unit="mm") is not value
+    assert pickle.loads(pickle.dumps(value)) is value
+
+
+def test_interned_attribute_value_keeps_argument_types():
+    """Test that equal arguments of different types get separate, unchanged instances."""
+    flag = AttributeValue("5", "mm", is_range_start=1)
+    value = AttributeValue("5", "mm", is_range_start=True)
+    
+    assert value is not flag
+    assert flag.is_range_start == 1 and type(flag.is_range_start) is int
+    assert value.is_range_start is True
+    
+    number = AttributeValue(5)
+    assert AttributeValue(5.0) is not number
+    assert type(number.raw_value) is int
@@ -0,0 +1,110 @@
+"""
+Tests for the Jepson extractor schemas.
+"""
+import pytest
+from src.botanical_parser.schemas import (
+    get_habit_schema,
+    get_stem_schema,
+    get_leaf_schema,
+    get_flower_schema,
+    get_fruit_schema,
+    get_jepson_schema
+)
+from src.botanical_parser.parser import parse_description
+from src.botanical_parser.attribute_value import AttributeValue
+
+
+def test_habit_schema():
+    """Test extracting growth form and height from a Habit section."""
+    node = get_habit_schema().extract("Habit: shrub or thicket-forming, 8--25 dm. Stem: prickles few.")
+    
+    assert node is not None
+    assert node.find_attributes("Growth Form")[0].values == [AttributeValue("shrub"), AttributeValue("thicket-forming")]
+    assert node.find_attributes("Height")[0].values == [
+        AttributeValue("8", unit="dm", is_range_start=True),
+        AttributeValue("25", unit="dm", is_range_end=True)
+    ]
+
+
+def test_stem_schema_with_prickles():
+    """Test extracting prickles as a child of a Stem section."""
+    text = "Stem: prickles few to many, paired or not, 3--15 mm, thick-based and compressed, generally curved (straight)."
+    node = get_stem_schema().extract(text)
+    
+    assert node is not None
+    prickle = node.find_children("Prickle")[0]
+    assert prickle.find_attributes("Count")[0].values == [AttributeValue("few"), AttributeValue("many")]
+    assert prickle.find_attributes("Length")[0].values == [
+        AttributeValue("3", unit="mm", is_range_start=True),
+        AttributeValue("15", unit="mm", is_range_end=True)
+    ]
+
+
+def test_leaf_schema_with_leaflets():
+    """Test extracting the axis and leaflets of a Leaf section."""
+    text = ("Leaf: axis +- shaggy-hairy (+- glabrous), hairs to 1 mm, glandless or glandular; "
+            "leaflets 5--7(9), +- hairy, sometimes glandular; terminal leaflet generally 15--50 mm, "
+            "margins single- or double-toothed, glandular or not.")
+    node = get_leaf_schema().extract(text)
+    
+    assert node is not None
+    assert [child.name for child in node.children] == ["Axis", "Leaflet", "Terminal Leaflet"]
+    axis = node.find_children("Axis")[0]
+    assert axis.find_attributes("Glandularity")[0].values == [AttributeValue("glandless"), AttributeValue("glandular")]
+    leaflet = node.find_children("Leaflet")[0]
+    assert leaflet.find_attributes("Count")[0].values == [
+        AttributeValue("5", is_range_start=True),
+        AttributeValue("7", is_range_end=True)
+    ]
+
+
+def test_flower_schema():
+    """Test extracting the parts of a Flower section."""
+    text = ("Flower: hypanthium 3--5.5 mm wide at flower, glabrous to sparsely hairy, glandless; "
+            "sepals glandular or not, entire; petals generally 15--25 mm, pink; pistils 20--40. Fruit: ovoid.")
+    node = get_flower_schema().extract(text)
+    
+    assert node is not None
+    assert [child.name for child in node.children] == ["Hypanthium", "Sepal", "Petal", "Pistil"]
+    hypanthium = node.find_children("Hypanthium")[0]
+    assert hypanthium.find_attributes("Width")[0].values == [
+        AttributeValue("3", unit="mm", is_range_start=True),
+        AttributeValue("5.5", unit="mm", is_range_end=True)
+    ]
+    assert hypanthium.find_attributes("Glandularity")[0].values == [AttributeValue("glandless")]
+    assert node.find_children("Petal")[0].find_attributes("Color")[0].values == [AttributeValue("pink")]
+
+
+def test_fruit_schema():
+    """Test extracting achenes from a Fruit section."""
+    node = get_fruit_schema().extract("Fruit: generally (ob)ovoid; achenes 3.5--4.5 mm.")
+    
+    assert node is not None
+    achene = node.find_children("Achene")[0]
+    assert achene.find_attributes("Length")[0].values == [
+        AttributeValue("3.5", unit="mm", is_range_start=True),
+        AttributeValue("4.5", unit="mm", is_range_end=True)
+    ]
+
+
+def test_schemas_share_attribute_extractors():
+    """Test that attribute extractors with fixed vocabularies are shared between schemas."""
+    leaf_axis = get_leaf_schema().child_extractors[0]
+    hypanthium = get_flower_schema().child_extractors[0]
+    
+    assert leaf_axis.attribute_extractors[-1] is hypanthium.attribute_extractors[-1]
+
+
+def test_parse_description():
+    """Test parsing a full description with the default Jepson schema."""
+    text = "Habit: shrub, 8--25 dm. Stem: prickles few. Leaf: axis glabrous. Flower: petals pink. Fruit: achenes 4 mm."
+    node = parse_description(text)
+    
+    assert [child.name for child in node.children] == ["Habit", "Stem", "Leaf", "Flower", "Fruit"]
+    assert get_jepson_schema().name == node.name
+
+
+def test_schemas_are_built_once():
+    """Test that each getter returns the same shared extractor tree."""
+    assert get_jepson_schema() is get_jepson_schema()
+    assert get_jepson_schema().child_extractors[2] is get_leaf_schema()
@@ -1,12 +1,18 @@
 """
 Tests for the StructureExtractor class.
 """
+import re
 import pytest
 from src.botanical_parser.structure_extractor import StructureExtractor
 from src.botanical_parser.attribute_extractor import QualitativeAttributeExtractor, NumericAttributeExtractor
 from src.botanical_parser.attribute_node import AttributeNode
 from src.botanical_parser.attribute_value import AttributeValue
 
+# Custom structure patterns, compiled once with the flags StructureExtractor
+# would use for string patterns
+LEAF_SPECIAL_RE = re.compile(r"Leaf:\s*(.+?)\s*\[special\]", re.IGNORECASE | re.DOTALL)
+DESCRIPTION_RE = re.compile(r"Description:\n((?:[^\n]+\n)+?)EndDescription", re.IGNORECASE | re.DOTALL)
+
 
 def test_structure_extractor_simple():
     """Test extracting a simple structure."""
@@ -43,6 +49,14 @@ def test_structure_extractor_no_match():
     assert node is None
 
 
+def test_structure_extractor_noun_region_ends_at_semicolon():
+    """Test that a noun-generated region stops at the next semicolon."""
+    extractor = StructureExtractor(name="Leaflet", noun="leaflets")
+    
+    assert extractor.pattern.search("Leaf: leaflets 5--7, green; tip acute").group(1) == "5--7, green"
+    assert extractor.pattern.search("Leaf: leaflets 5--7").group(1) == "5--7"
+
+
 def test_structure_extractor_with_children():
     """Test extracting a structure with child structures."""
     leaflet_extractor = StructureExtractor(
@@ -150,6 +164,28 @@ def test_pattern_multiline_custom():
     # You may want to check node.raw_text or similar, depending on implementation
 
 
+def test_pattern_compiled_custom():
+    """Test that compiled custom patterns are used as-is, with their own flags."""
+    extractor = StructureExtractor(
+        name="Leaf",
+        pattern=LEAF_SPECIAL_RE,
+        attribute_extractors=[QualitativeAttributeExtractor("Color", value_words=["green", "yellow"])]
+    )
+    assert extractor.pattern is LEAF_SPECIAL_RE
+    
+    node = extractor.extract("Leaf: green [special]\nLeaf: yellow\nStem: brown.")
+    assert node is not None
+    assert node.name == "Leaf"
+    assert node.attributes[0].values[0] == AttributeValue("green")
+    
+    extractor = StructureExtractor(name="Description", pattern=DESCRIPTION_RE, attribute_extractors=[])
+    assert extractor.pattern is DESCRIPTION_RE
+    
+    node = extractor.extract("Description:\nThis is line one.\nThis is line two.\nEndDescription\nOther: ignored.")
+    assert node is not None
+    assert node.name == "Description"
+
+
 def test_overlapping_child_structures():
     """Test handling of overlapping child structure regions."""
     first_extractor = StructureExtractor(
@@ -182,3 +218,22 @@ def test_overlapping_child_structures():
     
     # Verify second child
     assert node.children[1].name == "Second"
+
+
+def test_extract_region_matches_slice():
+    """Test that extracting a region of text matches extracting the sliced text."""
+    color_extractor = QualitativeAttributeExtractor("Color", value_words=["green", "brown"])
+    extractors = [
+        StructureExtractor(name="Leaf", noun="Leaf:", attribute_extractors=[color_extractor]),
+        # Anchored patterns must only match at the start of the region
+        StructureExtractor(name="Stem", pattern=r"^Stem:\s*(.+)", attribute_extractors=[color_extractor]),
+    ]
+    text = "Leaf: green; Stem: brown.\nStem: green."
+    
+    for extractor in extractors:
+        for pos in range(len(text)):
+            expected = extractor.extract(text[pos:])
+            actual = extractor.extract(text, pos, len(text))
+            assert (actual is None) == (expected is None)
+            if expected is not None:
+                assert actual.attributes[0].values == expected.attributes[0].values
@@ -85,6 +85,25 @@ def test_structure_node_find_children():
     assert len(root_results) == 0
 
 
+def test_structure_node_find_after_adding():
+    """Test that finds see nodes added after an earlier lookup."""
+    parent = StructureNode("Plant")
+    first_leaf = StructureNode("Leaf")
+    second_leaf = StructureNode("leaf")
+    parent.add_child(first_leaf)
+    parent.add_attribute(AttributeNode("Color"))
+    
+    assert parent.find_children("Leaf") == [first_leaf]
+    assert parent.find_attributes("Shape") == []
+    
+    parent.add_child(second_leaf)
+    shape_attr = AttributeNode("Shape")
+    parent.attributes.append(shape_attr)
+    
+    assert parent.find_children("LEAF") == [first_leaf, second_leaf]
+    assert parent.find_attributes("shape") == [shape_attr]
+
+
 def test_structure_node_to_dict():
     """Test converting a structure node to a dictionary."""
     plant = StructureNode("Plant")
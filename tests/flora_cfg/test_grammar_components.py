@@ -2,10 +2,14 @@
 Tests for the modular function-based grammar components.
 """
 import pytest
-from nltk.parse.recursivedescent import RecursiveDescentParser
+from collections import Counter
+from itertools import product
+from functools import lru_cache
+from nltk.parse import EarleyChartParser
+from nltk.parse.chart import TreeEdge
 from nltk.grammar import CFG, Nonterminal
 
-from src.flora_cfg.grammar.core import GrammarBuilder
+from src.flora_cfg.grammar.core import GrammarBuilder, to_lark_grammar
 from src.flora_cfg.grammar.components import (
     add_number_grammar,
     add_basic_terms_grammar,
@@ -13,19 +17,198 @@ from src.flora_cfg.grammar.components import (
     add_adjacent_qualifier_grammar,
     add_collective_qualifier_grammar,
     add_conjunction_grammar,
-    add_qualified_conjunction_grammar,
     add_value_grammar,
-    build_jepson_grammar
+    build_jepson_grammar,
+    NUMBER_TOKEN,
+    _STRUCTURAL_RULES
 )
 
+@lru_cache(maxsize=None)
+def _NT(name):
+    """Return the shared Nonterminal for a symbol name."""
+    return Nonterminal(name)
+
+@lru_cache(maxsize=None)
+def _make_parser(grammar):
+    """
+    Create a parser for a test grammar.
+    
+    An Earley chart parser shares sub-parses, so ambiguous grammars don't
+    blow up the way they do with recursive descent.
+    """
+    return EarleyChartParser(grammar)
+
+@lru_cache(maxsize=None)
+def _parse(grammar, tokens):
+    """
+    Parse a tuple of tokens with a grammar, returning a tuple of all parse trees.
+    
+    Results are memoized per grammar and tokens, so inputs repeated across
+    tests are only parsed once. The trees are frozen, since they are shared.
+    """
+    return tuple(tree.freeze() for tree in _make_parser(grammar).parse(tokens))
+
+@pytest.fixture(scope="module")
+def jepson_grammar():
+    """A complete Jepson grammar with minimal vocabulary, built once per module."""
+    # Use minimal vocabulary and limit grammar complexity
+    return build_jepson_grammar(
+        growth_forms=["herb", "shrub"],
+        surface_terms=["hairy", "glabrous"],
+        adjacent_qualifiers=["densely", "sparsely"],
+        collective_qualifiers=["generally", "sometimes"],
+        units=["mm", "cm"],
+        conjunctions=["or", "and"],
+        max_number=5  # Keep number range small
+    )
+
+@lru_cache(maxsize=None)
+def _build_component_grammar(*layers):
+    """
+    Build a grammar of numbers up to 5 plus the named component layers.
+    
+    Layers are added in a fixed order: adjacent qualifiers ("approximately",
+    "about"), units ("mm", "cm"), collective qualifiers ("generally",
+    "usually") and conjunctions ("or", "and").
+    """
+    # Create Nonterminals
+    value = _NT("VALUE")
+    simple_value = _NT("SIMPLE_VALUE")
+    number = _NT("NUMBER")
+    unit = _NT("UNIT")
+    unit_value = _NT("UNIT_VALUE")
+    adj_qualifier = _NT("ADJ_QUALIFIER")
+    coll_qualifier = _NT("COLL_QUALIFIER")
+    qualified_number = _NT("QUALIFIED_NUMBER")
+    qualified_value = _NT("QUALIFIED_VALUE")
+    conjunction = _NT("CONJUNCTION")
+    conjunction_value = _NT("CONJUNCTION_VALUE")
+    
+    # Initialize builder with start symbol
+    builder = GrammarBuilder(start_symbol=value)
+    
+    # Add number grammar
+    builder = add_number_grammar(builder, number, simple_value, value, max_number=5)
+    
+    if "adjacent_qualifier" in layers:
+        builder = add_adjacent_qualifier_grammar(
+            builder,
+            simple_value=simple_value,
+            value=value,
+            adj_qualifier=adj_qualifier,
+            qualified_value=qualified_value,
+            qualifiers=["approximately", "about"]
+        )
+    
+    if "unit" in layers:
+        builder = add_unit_grammar(
+            builder, 
+            number=number, 
+            value=value, 
+            adj_qualifier=adj_qualifier, 
+            unit=unit, 
+            unit_value=unit_value,
+            qualified_number=qualified_number,
+            units=["mm", "cm"]
+        )
+    
+    if "collective_qualifier" in layers:
+        builder = add_collective_qualifier_grammar(
+            builder,
+            value=value,
+            coll_qualifier=coll_qualifier,
+            qualified_value=qualified_value,
+            qualifiers=["generally", "usually"]
+        )
+    
+    if "conjunction" in layers:
+        builder = add_conjunction_grammar(
+            builder,
+            simple_value=simple_value,
+            value=value,
+            qualified_value=qualified_value,
+            conjunction=conjunction,
+            conjunction_value=conjunction_value,
+            conjunctions=["or", "and"]
+        )
+    
+    return builder.build()
+
+# Component layers added on top of the number grammar, each with the token
+# sequences the combined grammar must accept
+COMPONENT_CASES = (
+    ((), (("5",),)),
+    (("unit",), (("5",), ("5", "mm"))),
+    (("adjacent_qualifier", "unit"), (("5",), ("approximately", "5"), ("5", "mm"))),
+    (("adjacent_qualifier", "unit", "collective_qualifier"),
+     (("5",), ("approximately", "5"), ("5", "mm"), ("generally", "5"))),
+    (("adjacent_qualifier", "unit", "collective_qualifier", "conjunction"),
+     (("5",), ("approximately", "5"), ("5", "mm"), ("generally", "5"), ("5", "or", "4"))),
+)
+
+_COMPONENT_PARSE_CASES = [
+    pytest.param(layers, tokens, id="+".join(("number",) + layers) + ":" + " ".join(tokens))
+    for layers, token_cases in COMPONENT_CASES
+    for tokens in token_cases
+]
+
+# Token sequences the minimal Jepson grammar must accept
+JEPSON_CASES = (
+    # Basic types
+    ("5",),
+    ("hairy",),
+    # Simple expressions
+    ("5", "mm"),
+    ("densely", "hairy"),
+    # Simple conjunctions
+    ("hairy", "or", "glabrous"),
+    # Collective qualifiers on the right conjunct
+    ("herb", "or", "generally", "shrub"),
+    ("hairy", "or", "generally", "glabrous"),
+    # Collective qualifiers on a unit value as the left conjunct
+    ("generally", "5", "mm", "or", "5"),
+    ("generally", "5", "mm", "or", "herb"),
+)
+
+# The Jepson grammar as composed before collective qualifiers got their own
+# nonterminals, over a small vocabulary; a collective qualifier could then
+# apply to any value on either side of a conjunction
+BASELINE_GRAMMAR = CFG.fromstring("""
+VALUE -> SIMPLE_VALUE | UNIT_VALUE | QUALIFIED_VALUE | CONJUNCTION_VALUE | QUALIFIED_CONJUNCTION
+SIMPLE_VALUE -> NUMBER | GROWTH_FORM
+NUMBER -> '5'
+GROWTH_FORM -> 'herb'
+UNIT_VALUE -> NUMBER UNIT | QUALIFIED_NUMBER UNIT | CONJUNCTION_VALUE UNIT
+UNIT -> 'mm'
+QUALIFIED_NUMBER -> ADJ_QUALIFIER NUMBER
+ADJ_QUALIFIER -> 'sparsely'
+QUALIFIED_VALUE -> ADJ_QUALIFIER SIMPLE_VALUE | COLL_QUALIFIER VALUE
+COLL_QUALIFIER -> 'generally'
+CONJUNCTION_VALUE -> SIMPLE_VALUE CONJUNCTION SIMPLE_VALUE | QUALIFIED_VALUE CONJUNCTION SIMPLE_VALUE
+CONJUNCTION_VALUE -> SIMPLE_VALUE CONJUNCTION QUALIFIED_VALUE | QUALIFIED_VALUE CONJUNCTION QUALIFIED_VALUE
+CONJUNCTION -> 'or' | '--'
+QUALIFIED_CONJUNCTION -> COLL_QUALIFIER CONJUNCTION_VALUE
+""")
+
+BASELINE_VOCABULARY = ("5", "herb", "sparsely", "generally", "mm", "or", "--")
+
+@pytest.fixture(scope="module", params=["chart", "lark"])
+def jepson_parse(request, jepson_grammar):
+    """A function returning a parse tree for Jepson grammar tokens, using NLTK's chart parser or Lark."""
+    if request.param == "chart":
+        return lambda tokens: next(iter(_parse(jepson_grammar, tokens)), None)
+    lark = pytest.importorskip("lark")
+    parser = lark.Lark(to_lark_grammar(jepson_grammar), parser="earley")
+    return lambda tokens: parser.parse(" ".join(tokens))
+
 class TestGrammarComponents:
     
     def test_number_grammar(self):
         """Test the number grammar component."""
         # Create required nonterminals
-        value = Nonterminal("VALUE")
-        number = Nonterminal("NUMBER")
-        simple_value = Nonterminal("SIMPLE_VALUE")
+        value = _NT("VALUE")
+        number = _NT("NUMBER")
+        simple_value = _NT("SIMPLE_VALUE")
         
         # Initialize builder with Nonterminal start symbol
         builder = GrammarBuilder(start_symbol=value)
@@ -36,23 +219,21 @@ class TestGrammarComponents:
         )
         
         grammar = builder.build()
-        parser = RecursiveDescentParser(grammar)
         
         # Test parsing numbers
-        trees = list(parser.parse(["5"]))
-        assert len(trees) > 0
+        assert _parse(grammar, ("5",))
         
         # This should fail (not in grammar)
         with pytest.raises(ValueError):
-            list(parser.parse(["11"]))
+            _parse(grammar, ("11",))
     
     def test_basic_terms_grammar(self):
         """Test the basic terms grammar component."""
         # Create required nonterminals
-        value = Nonterminal("VALUE")
-        growth_form = Nonterminal("GROWTH_FORM")
-        surface = Nonterminal("SURFACE")
-        simple_value = Nonterminal("SIMPLE_VALUE")
+        value = _NT("VALUE")
+        growth_form = _NT("GROWTH_FORM")
+        surface = _NT("SURFACE")
+        simple_value = _NT("SIMPLE_VALUE")
         
         # Initialize builder with Nonterminal start symbol
         builder = GrammarBuilder(start_symbol=value)
@@ -64,26 +245,24 @@ class TestGrammarComponents:
         )
         
         grammar = builder.build()
-        parser = RecursiveDescentParser(grammar)
         
         # Test parsing basic terms
-        trees = list(parser.parse(["herb"]))
-        assert len(trees) > 0
+        assert _parse(grammar, ("herb",))
         
         # This should fail (not in grammar)
         with pytest.raises(ValueError):
-            list(parser.parse(["tree"]))
+            _parse(grammar, ("tree",))
     
     def test_composite_grammar(self):
         """Test combining multiple grammar components."""
         # Create required nonterminals
-        value = Nonterminal("VALUE")
-        number = Nonterminal("NUMBER")
-        simple_value = Nonterminal("SIMPLE_VALUE")
-        growth_form = Nonterminal("GROWTH_FORM")
-        surface = Nonterminal("SURFACE")
-        adj_qualifier = Nonterminal("ADJ_QUALIFIER")
-        qualified_value = Nonterminal("QUALIFIED_VALUE")
+        value = _NT("VALUE")
+        number = _NT("NUMBER")
+        simple_value = _NT("SIMPLE_VALUE")
+        growth_form = _NT("GROWTH_FORM")
+        surface = _NT("SURFACE")
+        adj_qualifier = _NT("ADJ_QUALIFIER")
+        qualified_value = _NT("QUALIFIED_VALUE")
         
         # Initialize builder with Nonterminal start symbol
         builder = GrammarBuilder(start_symbol=value)
@@ -104,30 +283,26 @@ class TestGrammarComponents:
         )
         
         grammar = builder.build()
-        parser = RecursiveDescentParser(grammar)
         
         # Test parsing a qualified term
-        trees = list(parser.parse(["sparsely", "herb"]))
-        assert len(trees) > 0
+        assert _parse(grammar, ("sparsely", "herb"))
         
         # Test parsing basic terms
-        trees = list(parser.parse(["herb"]))
-        assert len(trees) > 0
+        assert _parse(grammar, ("herb",))
         
         # Test parsing numbers
-        trees = list(parser.parse(["5"]))
-        assert len(trees) > 0
+        assert _parse(grammar, ("5",))
     
     def test_conjunction_grammar(self):
         """Test the conjunction grammar component."""
         # Create a grammar for testing conjunctions with qualifiers
-        value = Nonterminal("VALUE")
-        simple_value = Nonterminal("SIMPLE_VALUE")
-        conjunction = Nonterminal("CONJUNCTION")
-        conjunction_value = Nonterminal("CONJUNCTION_VALUE")
-        adj_qualifier = Nonterminal("ADJ_QUALIFIER")
-        coll_qualifier = Nonterminal("COLL_QUALIFIER")
-        qualified_value = Nonterminal("QUALIFIED_VALUE")
+        value = _NT("VALUE")
+        simple_value = _NT("SIMPLE_VALUE")
+        conjunction = _NT("CONJUNCTION")
+        conjunction_value = _NT("CONJUNCTION_VALUE")
+        adj_qualifier = _NT("ADJ_QUALIFIER")
+        coll_qualifier = _NT("COLL_QUALIFIER")
+        qualified_value = _NT("QUALIFIED_VALUE")
         
         # Initialize builder with Nonterminal start symbol
         builder = GrammarBuilder(start_symbol=value)
@@ -155,52 +330,49 @@ class TestGrammarComponents:
         builder.add_rule(value, [conjunction_value])
         
         grammar = builder.build()
-        parser = RecursiveDescentParser(grammar)
         
         # Test parsing a simple conjunction
-        trees = list(parser.parse(["red", "or", "blue"]))
-        assert len(trees) > 0
+        assert _parse(grammar, ("red", "or", "blue"))
         
         # Test parsing a qualified conjunction
-        trees = list(parser.parse(["light", "red", "or", "blue"]))
-        assert len(trees) > 0
+        assert _parse(grammar, ("light", "red", "or", "blue"))
         
         # Test parsing with collective qualifier
-        trees = list(parser.parse(["generally", "red"]))
-        assert len(trees) > 0
+        assert _parse(grammar, ("generally", "red"))
         
         # Test parsing qualified conjunction with collective qualifier
-        trees = list(parser.parse(["generally", "red", "or", "blue"]))
-        assert len(trees) > 0
+        assert _parse(grammar, ("generally", "red", "or", "blue"))
     
-    def test_build_jepson_grammar(self):
+    def test_build_jepson_grammar(self, jepson_parse):
         """Test the complete Jepson grammar builder with simplified grammar."""
-        # Use minimal vocabulary and limit grammar complexity
-        grammar = build_jepson_grammar(
-            growth_forms=["herb", "shrub"],
-            surface_terms=["hairy", "glabrous"],
-            adjacent_qualifiers=["densely", "sparsely"],
-            collective_qualifiers=["generally", "sometimes"],
-            units=["mm", "cm"],
-            conjunctions=["or", "and"],
-            max_number=5  # Keep number range small
-        )
-        parser = RecursiveDescentParser(grammar)
-        
-        # Test basic types individually
-        assert len(list(parser.parse(["5"]))) > 0
-        assert len(list(parser.parse(["hairy"]))) > 0
-        
-        # Test simple expressions
-        assert len(list(parser.parse(["5", "mm"]))) > 0
-        assert len(list(parser.parse(["densely", "hairy"]))) > 0
-        
-        # Test simple conjunctions
-        assert len(list(parser.parse(["hairy", "or", "glabrous"]))) > 0
+        for tokens in JEPSON_CASES:
+            assert jepson_parse(tokens) is not None, tokens
         
         # Skip more complex tests for now to avoid recursion issues
         # We'll address these in future grammar refinements
         
+    def test_baseline_language_is_unchanged(self):
+        """Test that the grammar accepts exactly the token sequences the baseline grammar did."""
+        grammar = build_jepson_grammar(
+            growth_forms=["herb"],
+            surface_terms=[],
+            adjacent_qualifiers=["sparsely"],
+            collective_qualifiers=["generally"],
+            units=["mm"],
+            conjunctions=["or", "--"],
+            max_number=5
+        )
+        
+        # Every sequence of up to four tokens; longer ones multiply the run time
+        # by the vocabulary size for each extra token
+        differences = [
+            tokens
+            for length in range(1, 5)
+            for tokens in product(BASELINE_VOCABULARY, repeat=length)
+            if bool(_parse(BASELINE_GRAMMAR, tokens)) != bool(_parse(grammar, tokens))
+        ]
+        assert not differences
+        
     def test_grammar_ambiguity(self):
         """Test for grammar ambiguity with a simplified grammar."""
         # Create a much simpler grammar with minimal vocabulary
@@ -213,49 +385,48 @@ class TestGrammarComponents:
             conjunctions=[],  # No conjunctions
             max_number=1  # Just one number
         )
-        parser = RecursiveDescentParser(grammar)
-        
-        # Check if a simple term can be parsed
-        try:
-            trees = list(parser.parse(["herb"]))
-            if len(trees) > 1:
-                print(f"Note: Grammar is ambiguous - 'herb' has {len(trees)} parse trees")
-        except RecursionError:
-            # If we still get recursion errors, at least don't fail the test
-            print("RecursionError occurred during parsing - grammar needs further refinement")
-            
-        # This test is informational, not a pass/fail test
-        
-    def test_isolated_number_grammar(self):
-        """Test the number grammar component in isolation."""
-        # Create Nonterminals
-        value = Nonterminal("VALUE")
-        simple_value = Nonterminal("SIMPLE_VALUE")
-        number = Nonterminal("NUMBER")
-        
-        # Initialize builder with start symbol
-        builder = GrammarBuilder(start_symbol=value)
-        
-        # Add only the number grammar
-        builder = add_number_grammar(builder, number, simple_value, value, max_number=5)
         
-        grammar = builder.build()
-        parser = RecursiveDescentParser(grammar)
-        
-        # Test parsing a simple number
-        trees = list(parser.parse(["5"]))
-        assert len(trees) > 0
+        # Check if a simple term can be parsed, from the chart alone: complete
+        # edges are counted rather than expanding every parse tree
+        chart = _make_parser(grammar).chart_parse(("herb",))
+        spans = [
+            (edge.lhs(), edge.span())
+            for edge in chart.edges()
+            if isinstance(edge, TreeEdge) and edge.is_complete()
+        ]
+        assert (grammar.start(), (0, chart.num_leaves())) in spans
+        
+        # A nonterminal completed more than once over the same span has
+        # several derivations there; a single growth form must have only one
+        ambiguous = [span for span, count in Counter(spans).items() if count > 1]
+        assert not ambiguous, f"'herb' has several derivations for {ambiguous} in {chart.num_edges()} edges"
+        
+    @pytest.mark.parametrize("tokens", [("herb",), ("hairy", "or", "glabrous"), ("generally", "hairy", "or", "glabrous")])
+    def test_grammar_ambiguity_forest(self, jepson_grammar, tokens):
+        """Test that Lark's shared parse forest flags exactly the inputs with several parse trees."""
+        lark = pytest.importorskip("lark")
+        parser = lark.Lark(to_lark_grammar(jepson_grammar), parser="earley", ambiguity="explicit")
+        
+        # Ambiguities are packed into _ambig nodes instead of expanded into trees
+        forest = parser.parse(" ".join(tokens))
+        is_ambiguous = any(True for _ in forest.find_data("_ambig"))
+        
+        assert is_ambiguous == (len(_parse(jepson_grammar, tokens)) > 1)
+        
+    @pytest.mark.parametrize("layers, tokens", _COMPONENT_PARSE_CASES)
+    def test_component_grammar_parses(self, layers, tokens):
+        """Test that each combination of grammar components parses its inputs."""
+        assert _parse(_build_component_grammar(*layers), tokens)
         
-    def test_number_unit_grammar(self):
-        """Test the combination of number and unit grammar components."""
+    def test_simplified_conjunction_grammar(self):
+        """Test a simplified version with just number and conjunction grammar."""
         # Create Nonterminals
-        value = Nonterminal("VALUE")
-        simple_value = Nonterminal("SIMPLE_VALUE")
-        number = Nonterminal("NUMBER")
-        unit = Nonterminal("UNIT")
-        unit_value = Nonterminal("UNIT_VALUE")
-        adj_qualifier = Nonterminal("ADJ_QUALIFIER")  # Required by unit grammar
-        qualified_number = Nonterminal("QUALIFIED_NUMBER")  # Required by unit grammar
+        value = _NT("VALUE")
+        simple_value = _NT("SIMPLE_VALUE")
+        number = _NT("NUMBER")
+        conjunction = _NT("CONJUNCTION")
+        conjunction_value = _NT("CONJUNCTION_VALUE")
+        qualified_value = _NT("QUALIFIED_VALUE")  # Required by conjunction grammar
         
         # Initialize builder with start symbol
         builder = GrammarBuilder(start_symbol=value)
@@ -263,272 +434,180 @@ class TestGrammarComponents:
         # Add number grammar
         builder = add_number_grammar(builder, number, simple_value, value, max_number=5)
         
-        # Add unit grammar with minimal unit list
-        builder = add_unit_grammar(
-            builder, 
-            number=number, 
-            value=value, 
-            adj_qualifier=adj_qualifier, 
-            unit=unit, 
-            unit_value=unit_value,
-            qualified_number=qualified_number,
-            units=["mm", "cm"]
-        )
+        # Add simplified conjunction grammar manually without using add_conjunction_grammar
+        # to avoid potential recursion
+        builder.add_values(conjunction, ["or", "and"])
+        
+        # Only add the direct conjunction of simple values to avoid recursion
+        builder.add_rule(conjunction_value, [simple_value, conjunction, simple_value])
+        
+        # Register conjunction value as a value type
+        builder.add_rule(value, [conjunction_value])
         
         grammar = builder.build()
-        parser = RecursiveDescentParser(grammar)
         
         # Test parsing a number
-        trees = list(parser.parse(["5"]))
-        assert len(trees) > 0
+        assert _parse(grammar, ("5",))
         
-        # Test parsing a number with unit
-        trees = list(parser.parse(["5", "mm"]))
-        assert len(trees) > 0
+        # Test parsing with conjunction
+        assert _parse(grammar, ("5", "or", "4"))
+        
+    def test_presized_builder(self):
+        """Test that pre-sizing the builder does not change the built grammar."""
+        value = _NT("VALUE")
+        number = _NT("NUMBER")
+        simple_value = _NT("SIMPLE_VALUE")
+        
+        # Estimate both too many and too few rules
+        for estimated_rules in (0, 3, 50):
+            builder = GrammarBuilder(start_symbol=value, estimated_rules=estimated_rules)
+            builder = add_number_grammar(builder, number, simple_value, value, max_number=10)
+            grammar = builder.build()
+            
+            assert len(grammar.productions()) == 12
+            assert None not in grammar.productions()
+        
+    def test_productions_are_read_only(self):
+        """Test that productions shows only the rules added, and can't be appended to."""
+        value = _NT("VALUE")
+        builder = GrammarBuilder(start_symbol=value, estimated_rules=10)
+        builder.add_values(value, ["herb", "shrub"])
+        
+        assert [p.rhs() for p in builder.productions] == [("herb",), ("shrub",)]
+        with pytest.raises(AttributeError):
+            builder.productions.append(None)
+        with pytest.raises(AttributeError):
+            builder.productions = []
+        
+    def test_jepson_grammar_size_estimate(self):
+        """Test that the builder size estimate counts the Jepson grammar's rules exactly."""
+        vocabulary = ["herb", "hairy", "densely", "generally", "mm", "or"]
+        grammar = build_jepson_grammar(
+            growth_forms=vocabulary[:1],
+            surface_terms=vocabulary[1:2],
+            adjacent_qualifiers=vocabulary[2:3],
+            collective_qualifiers=vocabulary[3:4],
+            units=vocabulary[4:5],
+            conjunctions=vocabulary[5:],
+            max_number=5
+        )
         
-    def test_with_adjacent_qualifier(self):
-        """Test the combination of number, unit, and adjacent qualifier grammar components."""
-        # Create Nonterminals
-        value = Nonterminal("VALUE")
-        simple_value = Nonterminal("SIMPLE_VALUE")
-        number = Nonterminal("NUMBER")
-        unit = Nonterminal("UNIT")
-        unit_value = Nonterminal("UNIT_VALUE")
-        adj_qualifier = Nonterminal("ADJ_QUALIFIER")
-        qualified_number = Nonterminal("QUALIFIED_NUMBER")
-        qualified_value = Nonterminal("QUALIFIED_VALUE")
+        assert len(grammar.productions()) == 5 + len(vocabulary) + _STRUCTURAL_RULES
         
-        # Initialize builder with start symbol
-        builder = GrammarBuilder(start_symbol=value)
+    def test_add_values_deduplicates(self):
+        """Test that repeated values only produce one terminal rule each."""
+        value = _NT("VALUE")
         
-        # Add number grammar
-        builder = add_number_grammar(builder, number, simple_value, value, max_number=5)
+        builder = GrammarBuilder(start_symbol=value)
+        builder.add_values(value, ["herb", "shrub", "herb"])
+        grammar = builder.build()
         
-        # Add adjacent qualifier grammar
-        builder = add_adjacent_qualifier_grammar(
-            builder,
-            simple_value=simple_value,
-            value=value,
-            adj_qualifier=adj_qualifier,
-            qualified_value=qualified_value,
-            qualifiers=["approximately", "about"]
-        )
+        assert [p.rhs() for p in grammar.productions()] == [("herb",), ("shrub",)]
         
-        # Add unit grammar
-        builder = add_unit_grammar(
-            builder, 
-            number=number, 
-            value=value, 
-            adj_qualifier=adj_qualifier, 
-            unit=unit, 
-            unit_value=unit_value,
-            qualified_number=qualified_number,
-            units=["mm", "cm"]
-        )
+    def test_add_values_bulk(self):
+        """Test adding terminal rules from a generator in one batch."""
+        number = _NT("NUMBER")
         
+        builder = GrammarBuilder(start_symbol=number)
+        builder.add_values_bulk(number, map(str, range(1, 4))).add_values_bulk(number, iter(["10"]))
         grammar = builder.build()
-        parser = RecursiveDescentParser(grammar)
-        
-        # Test parsing a number
-        trees = list(parser.parse(["5"]))
-        assert len(trees) > 0
         
-        # Test parsing with adjacent qualifier
-        trees = list(parser.parse(["approximately", "5"]))
-        assert len(trees) > 0
+        assert [p.rhs() for p in grammar.productions()] == [("1",), ("2",), ("3",), ("10",)]
         
-        # Test parsing with unit
-        trees = list(parser.parse(["5", "mm"]))
-        assert len(trees) > 0
+    def test_empty_vocabulary_is_not_replaced_by_defaults(self):
+        """Test that an explicitly empty list adds no terms instead of the defaults."""
+        value = _NT("VALUE")
+        unit = _NT("UNIT")
         
-    def test_with_collective_qualifier(self):
-        """Test the combination of all grammar components including collective qualifiers."""
-        # Create Nonterminals
-        value = Nonterminal("VALUE")
-        simple_value = Nonterminal("SIMPLE_VALUE")
-        number = Nonterminal("NUMBER")
-        unit = Nonterminal("UNIT")
-        unit_value = Nonterminal("UNIT_VALUE")
-        adj_qualifier = Nonterminal("ADJ_QUALIFIER")
-        coll_qualifier = Nonterminal("COLL_QUALIFIER")
-        qualified_number = Nonterminal("QUALIFIED_NUMBER")
-        qualified_value = Nonterminal("QUALIFIED_VALUE")
-        
-        # Initialize builder with start symbol
         builder = GrammarBuilder(start_symbol=value)
-        
-        # Add number grammar
-        builder = add_number_grammar(builder, number, simple_value, value, max_number=5)
-        
-        # Add adjacent qualifier grammar
-        builder = add_adjacent_qualifier_grammar(
-            builder,
-            simple_value=simple_value,
-            value=value,
-            adj_qualifier=adj_qualifier,
-            qualified_value=qualified_value,
-            qualifiers=["approximately", "about"]
-        )
-        
-        # Add unit grammar
         builder = add_unit_grammar(
-            builder, 
-            number=number, 
-            value=value, 
-            adj_qualifier=adj_qualifier, 
-            unit=unit, 
-            unit_value=unit_value,
-            qualified_number=qualified_number,
-            units=["mm", "cm"]
-        )
-        
-        # Add collective qualifier grammar
-        builder = add_collective_qualifier_grammar(
             builder,
+            number=_NT("NUMBER"),
             value=value,
-            coll_qualifier=coll_qualifier,
-            qualified_value=qualified_value,
-            qualifiers=["generally", "usually"]
+            adj_qualifier=_NT("ADJ_QUALIFIER"),
+            unit=unit,
+            unit_value=_NT("UNIT_VALUE"),
+            qualified_number=_NT("QUALIFIED_NUMBER"),
+            units=[]
         )
-        
         grammar = builder.build()
-        parser = RecursiveDescentParser(grammar)
         
-        # Test parsing a number
-        trees = list(parser.parse(["5"]))
-        assert len(trees) > 0
+        assert grammar.productions(lhs=unit) == []
         
-        # Test parsing with adjacent qualifier
-        trees = list(parser.parse(["approximately", "5"]))
-        assert len(trees) > 0
+    def test_build_jepson_grammar_is_cached(self):
+        """Test that identical arguments return the same grammar instance."""
+        first = build_jepson_grammar(growth_forms=["herb"], max_number=5)
+        second = build_jepson_grammar(growth_forms=("herb",), max_number=5)
+        other = build_jepson_grammar(growth_forms=["shrub"], max_number=5)
         
-        # Test parsing with unit
-        trees = list(parser.parse(["5", "mm"]))
-        assert len(trees) > 0
+        assert first is second
+        assert first is not other
         
-        # Test parsing with collective qualifier
-        trees = list(parser.parse(["generally", "5"]))
-        assert len(trees) > 0
-        
-    def test_with_conjunctions(self):
-        """Test the full combination of grammar components including conjunctions."""
-        # Create Nonterminals
-        value = Nonterminal("VALUE")
-        simple_value = Nonterminal("SIMPLE_VALUE")
-        number = Nonterminal("NUMBER")
-        unit = Nonterminal("UNIT")
-        unit_value = Nonterminal("UNIT_VALUE")
-        adj_qualifier = Nonterminal("ADJ_QUALIFIER")
-        coll_qualifier = Nonterminal("COLL_QUALIFIER")
-        qualified_number = Nonterminal("QUALIFIED_NUMBER")
-        qualified_value = Nonterminal("QUALIFIED_VALUE")
-        conjunction = Nonterminal("CONJUNCTION")
-        conjunction_value = Nonterminal("CONJUNCTION_VALUE")
+    def test_conjunction_grammar_is_left_factored(self):
+        """Test that both sides of a conjunction share a single CONJUNCT choice."""
+        simple_value = _NT("SIMPLE_VALUE")
+        value = _NT("VALUE")
+        qualified_value = _NT("QUALIFIED_VALUE")
+        adj_qualifier = _NT("ADJ_QUALIFIER")
+        conjunction_value = _NT("CONJUNCTION_VALUE")
         
-        # Initialize builder with start symbol
         builder = GrammarBuilder(start_symbol=value)
-        
-        # Add number grammar
-        builder = add_number_grammar(builder, number, simple_value, value, max_number=5)
-        
-        # Add adjacent qualifier grammar
-        builder = add_adjacent_qualifier_grammar(
-            builder,
-            simple_value=simple_value,
-            value=value,
-            adj_qualifier=adj_qualifier,
-            qualified_value=qualified_value,
-            qualifiers=["approximately", "about"]
-        )
-        
-        # Add unit grammar
-        builder = add_unit_grammar(
-            builder, 
-            number=number, 
-            value=value, 
-            adj_qualifier=adj_qualifier, 
-            unit=unit, 
-            unit_value=unit_value,
-            qualified_number=qualified_number,
-            units=["mm", "cm"]
-        )
-        
-        # Add collective qualifier grammar
-        builder = add_collective_qualifier_grammar(
-            builder,
-            value=value,
-            coll_qualifier=coll_qualifier,
-            qualified_value=qualified_value,
-            qualifiers=["generally", "usually"]
-        )
-        
-        # Add conjunction grammar
+        builder.add_values(simple_value, ["hairy", "glabrous"])
+        builder.add_values(adj_qualifier, ["sparsely"])
+        builder.add_rule(qualified_value, (adj_qualifier, simple_value))
         builder = add_conjunction_grammar(
             builder,
             simple_value=simple_value,
             value=value,
             qualified_value=qualified_value,
-            conjunction=conjunction,
+            conjunction=_NT("CONJUNCTION"),
             conjunction_value=conjunction_value,
-            conjunctions=["or", "and"]
+            conjunctions=["or"]
         )
-        
         grammar = builder.build()
-        parser = RecursiveDescentParser(grammar)
-        
-        # Test parsing a number
-        trees = list(parser.parse(["5"]))
-        assert len(trees) > 0
         
-        # Test parsing with adjacent qualifier
-        trees = list(parser.parse(["approximately", "5"]))
-        assert len(trees) > 0
+        assert len(grammar.productions(lhs=conjunction_value)) == 1
+        assert len(_parse(grammar, ("hairy", "or", "glabrous"))) == 1
+        assert len(_parse(grammar, ("sparsely", "hairy", "or", "glabrous"))) == 1
+        assert len(_parse(grammar, ("hairy", "or", "sparsely", "glabrous"))) == 1
         
-        # Test parsing with unit
-        trees = list(parser.parse(["5", "mm"]))
-        assert len(trees) > 0
+    def test_number_token_grammar(self):
+        """Test that max_number=None adds a single placeholder number rule."""
+        value = _NT("VALUE")
+        number = _NT("NUMBER")
         
-        # Test parsing with collective qualifier
-        trees = list(parser.parse(["generally", "5"]))
-        assert len(trees) > 0
-        
-        # Test parsing with conjunction
-        trees = list(parser.parse(["5", "or", "4"]))
-        assert len(trees) > 0
-        
-    def test_simplified_conjunction_grammar(self):
-        """Test a simplified version with just number and conjunction grammar."""
-        # Create Nonterminals
-        value = Nonterminal("VALUE")
-        simple_value = Nonterminal("SIMPLE_VALUE")
-        number = Nonterminal("NUMBER")
-        conjunction = Nonterminal("CONJUNCTION")
-        conjunction_value = Nonterminal("CONJUNCTION_VALUE")
-        qualified_value = Nonterminal("QUALIFIED_VALUE")  # Required by conjunction grammar
-        
-        # Initialize builder with start symbol
         builder = GrammarBuilder(start_symbol=value)
-        
-        # Add number grammar
-        builder = add_number_grammar(builder, number, simple_value, value, max_number=5)
-        
-        # Add simplified conjunction grammar manually without using add_conjunction_grammar
-        # to avoid potential recursion
-        builder.add_values(conjunction, ["or", "and"])
-        
-        # Only add the direct conjunction of simple values to avoid recursion
-        builder.add_rule(conjunction_value, [simple_value, conjunction, simple_value])
-        
-        # Register conjunction value as a value type
-        builder.add_rule(value, [conjunction_value])
-        
+        builder = add_number_grammar(builder, number, _NT("SIMPLE_VALUE"), value, max_number=None)
         grammar = builder.build()
-        parser = RecursiveDescentParser(grammar)
         
-        # Test parsing a number
-        trees = list(parser.parse(["5"]))
-        assert len(trees) > 0
+        assert [p.rhs() for p in grammar.productions(lhs=number)] == [(NUMBER_TOKEN,)]
+        assert len(_parse(grammar, (NUMBER_TOKEN,))) == 1
+    
+    def test_lark_grammar_skips_unmatchable_rules(self):
+        """Test that duplicate productions and ones using empty vocabularies are left out."""
+        value = _NT("VALUE")
+        simple_value = _NT("SIMPLE_VALUE")
+        builder = GrammarBuilder(start_symbol=value)
+        builder.add_rule(value, (simple_value,))
+        builder.add_rule(value, (simple_value,))
+        builder.add_rule(value, (simple_value, _NT("UNIT")))
+        builder.add_values(simple_value, ["herb"])
         
-        # Test parsing with conjunction
-        trees = list(parser.parse(["5", "or", "4"]))
-        assert len(trees) > 0
+        assert builder.build_lark().splitlines()[:3] == ['start: value', 'value: simple_value', 'simple_value: "herb"']
+    
+    def test_build_lark(self):
+        """Test emitting a grammar as a Lark grammar definition."""
+        value = _NT("VALUE")
+        simple_value = _NT("SIMPLE_VALUE")
+        builder = GrammarBuilder(start_symbol=value)
+        builder.add_rule(value, (simple_value,))
+        builder.add_values(simple_value, ["herb", "+-"])
+        
+        assert builder.build_lark().splitlines() == [
+            'start: value',
+            'value: simple_value',
+            'simple_value: "herb"',
+            '    | "+-"',
+            '%import common.WS',
+            '%ignore WS',
+        ]
@@ -2,7 +2,7 @@
 Tests for the botanical value parser.
 """
 import pytest
-from src.flora_cfg.parsers.value_parser import BotanicalValueParser
+from src.flora_cfg.parsers.value_parser import BotanicalValueParser, get_default_parser, is_number, parse_values
 from src.flora_cfg.models.expression import (
     ValueExpression, 
     QualifierExpression, 
@@ -10,150 +10,120 @@ from src.flora_cfg.models.expression import (
     RangeExpression
 )
 
+def _word(value):
+    return ValueExpression(value, "word")
+
+def _number(value):
+    return ValueExpression(value, "number")
+
+# Input text and the expression tree it parses to
+CASES = [
+    # Simple word and numeric values
+    ("hairy", _word("hairy")),
+    ("shrub", _word("shrub")),
+    ("5", _number(5)),
+    # Adjacent and collective qualifiers, alone and nested
+    ("sparsely hairy", QualifierExpression("sparsely", _word("hairy"), "adjacent")),
+    ("generally hairy", QualifierExpression("generally", _word("hairy"), "collective")),
+    ("generally sparsely hairy",
+     QualifierExpression("generally", QualifierExpression("sparsely", _word("hairy"), "adjacent"), "collective")),
+    # Conjunctions of plain and qualified values
+    ("glabrous or hairy", ConjunctionExpression("or", [_word("glabrous"), _word("hairy")])),
+    ("sparsely hairy or densely pubescent", ConjunctionExpression("or", [
+        QualifierExpression("sparsely", _word("hairy"), "adjacent"),
+        QualifierExpression("densely", _word("pubescent"), "adjacent"),
+    ])),
+    # A collective qualifier can qualify the right conjunct alone
+    ("herb or generally shrub", ConjunctionExpression("or", [
+        _word("herb"),
+        QualifierExpression("generally", _word("shrub"), "collective"),
+    ])),
+    ("hairy or generally glabrous", ConjunctionExpression("or", [
+        _word("hairy"),
+        QualifierExpression("generally", _word("glabrous"), "collective"),
+    ])),
+    # A collective qualifier can qualify a unit value on the left alone
+    ("generally 5 mm -- herb", ConjunctionExpression("--", [
+        QualifierExpression("generally", QualifierExpression("mm", _number(5), "unit"), "collective"),
+        _word("herb"),
+    ])),
+    ("generally 5 mm or 5", ConjunctionExpression("or", [
+        QualifierExpression("generally", QualifierExpression("mm", _number(5), "unit"), "collective"),
+        _number(5),
+    ])),
+    ("generally 5 mm -- 5", ConjunctionExpression("--", [
+        QualifierExpression("generally", QualifierExpression("mm", _number(5), "unit"), "collective"),
+        _number(5),
+    ])),
+    ("generally 5 mm or herb", ConjunctionExpression("or", [
+        QualifierExpression("generally", QualifierExpression("mm", _number(5), "unit"), "collective"),
+        _word("herb"),
+    ])),
+    ("generally 5 mm or 10 mm", QualifierExpression("mm", ConjunctionExpression("or", [
+        QualifierExpression("generally", QualifierExpression("mm", _number(5), "unit"), "collective"),
+        _number(10),
+    ]), "unit")),
+    ("generally 5 mm to 10 mm", QualifierExpression("mm", ConjunctionExpression("to", [
+        QualifierExpression("generally", QualifierExpression("mm", _number(5), "unit"), "collective"),
+        _number(10),
+    ]), "unit")),
+    # ... or a qualified conjunction on the left
+    ("generally 5 or 10 -- 20", ConjunctionExpression("--", [
+        QualifierExpression("generally", ConjunctionExpression("or", [_number(5), _number(10)]), "collective"),
+        _number(20),
+    ])),
+    # Ranges, with "--" or "to"
+    ("1 -- 5", RangeExpression(_number(1), _number(5))),
+    ("1 to 5", RangeExpression(_number(1), _number(5))),
+    # For now, units are handled as qualifiers
+    ("5 mm", QualifierExpression("mm", _number(5), "unit")),
+    # A collective qualifier scopes over the whole "glabrous to sparsely hairy"
+    ("generally glabrous to sparsely hairy", QualifierExpression("generally", ConjunctionExpression("to", [
+        _word("glabrous"),
+        QualifierExpression("sparsely", _word("hairy"), "adjacent"),
+    ]), "collective")),
+    # Numbers are not limited to a fixed range
+    ("150--250", RangeExpression(_number(150), _number(250))),
+    ("2.5 mm", QualifierExpression("mm", _number(2.5), "unit")),
+]
+
 class TestBotanicalValueParser:
     """Test cases for the BotanicalValueParser class."""
     
-    @pytest.fixture
+    @pytest.fixture(scope="module")
     def parser(self):
-        """Create a parser instance for tests."""
+        """Create a parser instance, shared by the tests in this module since parsing keeps no state."""
         return BotanicalValueParser()
     
-    def test_simple_values(self, parser):
-        """Test parsing of simple values."""
-        # Test simple word values
-        result = parser.parse("hairy")
-        assert isinstance(result, ValueExpression)
-        assert result.value == "hairy"
-        assert result.value_type == "word"
-        
-        result = parser.parse("shrub")
-        assert isinstance(result, ValueExpression)
-        assert result.value == "shrub"
-        assert result.value_type == "word"
-        
-        # Test numeric values
-        result = parser.parse("5")
-        assert isinstance(result, ValueExpression)
-        assert result.value == 5
-        assert result.value_type == "number"
+    @pytest.mark.parametrize("text, expected", CASES)
+    def test_parse(self, parser, text, expected):
+        """Test parsing text into the expected expression tree."""
+        assert parser.parse(text).to_dict() == expected.to_dict()
     
-    def test_adjacent_qualifiers(self, parser):
-        """Test parsing of adjacent qualifiers."""
-        result = parser.parse("sparsely hairy")
-        
-        assert isinstance(result, QualifierExpression)
-        assert result.qualifier == "sparsely"
-        assert result.qualifier_type == "adjacent"
-        
-        assert isinstance(result.expression, ValueExpression)
-        assert result.expression.value == "hairy"
+    def test_tokenize(self, parser):
+        """Test tokenization of ranges, units and punctuation."""
+        assert parser.tokenize("5--10 mm") == ["5", "--", "10", "mm"]
+        assert parser.tokenize("Generally 5 -- to 10") == ["generally", "5", "--", "10"]
+        assert parser.tokenize("2.5--tomentose") == ["2.5", "--", "tomentose"]
     
-    def test_collective_qualifiers(self, parser):
-        """Test parsing of collective qualifiers."""
-        result = parser.parse("generally hairy")
-        
-        assert isinstance(result, QualifierExpression)
-        assert result.qualifier == "generally"
-        assert result.qualifier_type == "collective"
-        
-        assert isinstance(result.expression, ValueExpression)
-        assert result.expression.value == "hairy"
-    
-    def test_nested_qualifiers(self, parser):
-        """Test parsing of nested qualifiers."""
-        result = parser.parse("generally sparsely hairy")
-        
-        assert isinstance(result, QualifierExpression)
-        assert result.qualifier == "generally"
-        assert result.qualifier_type == "collective"
-        
-        assert isinstance(result.expression, QualifierExpression)
-        assert result.expression.qualifier == "sparsely"
-        assert result.expression.qualifier_type == "adjacent"
-        
-        assert isinstance(result.expression.expression, ValueExpression)
-        assert result.expression.expression.value == "hairy"
-    
-    def test_conjunctions(self, parser):
-        """Test parsing of conjunctions."""
-        result = parser.parse("glabrous or hairy")
-        
-        assert isinstance(result, ConjunctionExpression)
-        assert result.conjunction == "or"
-        assert len(result.expressions) == 2
-        
-        assert isinstance(result.expressions[0], ValueExpression)
-        assert result.expressions[0].value == "glabrous"
-        
-        assert isinstance(result.expressions[1], ValueExpression)
-        assert result.expressions[1].value == "hairy"
+    def test_default_parser_is_shared(self):
+        """Test that the default parser is only constructed once."""
+        assert get_default_parser() is get_default_parser()
+        assert isinstance(get_default_parser().parse("hairy"), ValueExpression)
     
-    def test_qualified_conjunctions(self, parser):
-        """Test parsing of qualified conjunctions."""
-        result = parser.parse("sparsely hairy or densely pubescent")
+    @pytest.mark.parametrize("workers", [1, 2])
+    def test_parse_values(self, workers):
+        """Test batch parsing in the calling process and in a process pool."""
+        texts = ["hairy", "5--10 mm", "generally glabrous to sparsely hairy"]
+        results = parse_values(texts, workers=workers)
         
-        assert isinstance(result, ConjunctionExpression)
-        assert result.conjunction == "or"
-        assert len(result.expressions) == 2
-        
-        assert isinstance(result.expressions[0], QualifierExpression)
-        assert result.expressions[0].qualifier == "sparsely"
-        assert result.expressions[0].expression.value == "hairy"
-        
-        assert isinstance(result.expressions[1], QualifierExpression)
-        assert result.expressions[1].qualifier == "densely"
-        assert result.expressions[1].expression.value == "pubescent"
-    
-    def test_ranges(self, parser):
-        """Test parsing of ranges."""
-        result = parser.parse("1 -- 5")
-        
-        assert isinstance(result, RangeExpression)
-        assert result.start.value == 1
-        assert result.end.value == 5
-        
-        # Test with "to" instead of "--"
-        result = parser.parse("1 to 5")
-        
-        assert isinstance(result, RangeExpression)
-        assert result.start.value == 1
-        assert result.end.value == 5
-    
-    def test_unit_values(self, parser):
-        """Test parsing values with units."""
-        # For now, units are handled as qualifiers
-        result = parser.parse("5 mm")
-        
-        assert isinstance(result, QualifierExpression)
-        assert result.qualifier == "mm"
-        assert result.qualifier_type == "unit"
-        
-        assert isinstance(result.expression, ValueExpression)
-        assert result.expression.value == 5
-    
-    def test_complex_expressions(self, parser):
-        """Test parsing of more complex expressions."""
-        result = parser.parse("generally glabrous to sparsely hairy")
-    
-        # The expression should be a QualifierExpression with "generally" as the qualifier
-        # for the entire "glabrous to sparsely hairy" expression
-        assert isinstance(result, QualifierExpression)
-        assert result.qualifier == "generally"
-        assert result.qualifier_type == "collective"
-        
-        # The inner expression should be a ConjunctionExpression with "to" as the conjunction
-        inner = result.expression
-        assert isinstance(inner, ConjunctionExpression)
-        assert inner.conjunction == "to"
-        
-        # Check left side (glabrous)
-        left = inner.expressions[0]
-        assert isinstance(left, ValueExpression)
-        assert left.value == "glabrous"
-        
-        # Check right side (sparsely hairy)
-        right = inner.expressions[1]
-        assert isinstance(right, QualifierExpression)
-        assert right.qualifier == "sparsely"
-        assert isinstance(right.expression, ValueExpression)
-        assert right.expression.value == "hairy"
+        assert [r.to_dict() for r in results] == [get_default_parser().parse(t).to_dict() for t in texts]
+
+
+@pytest.mark.parametrize("value, expected", [
+    ("5", True), ("2.5", True), ("hairy", False), ("", False),
+    (5, True), (None, False), (["5"], False), ({"5": 5}, False),
+])
+def test_is_number(value, expected):
+    """Test number detection, including non-string and unhashable input."""
+    assert is_number(value) is expected
@@ -1,4 +1,6 @@
-from src.feature_extractor import FeatureExtractor
+import re
+import pytest
+from src.feature_extractor import FeatureExtractor, _MATCH, _SLICE
 
 
 def test_feature_extractor_basic():
@@ -39,12 +41,12 @@ def test_feature_extractor_split():
     node = matcher.extract(text)
     assert node.name == 'Root'
     assert len(node.children) == 2
-    assert {(c.name, c.value) for c in node.children} \
-        == {('Item1', None), ('Item2', None)}
-    assert {(c.name, c.value) for c in node.children[0].children} \
-        == {('Color', 'red')}
-    assert {(c.name, c.value) for c in node.children[1].children} \
-        == {('Color', 'green')}
+    assert [(c.name, c.value) for c in node.children] \
+        == [('Item1', None), ('Item2', None)]
+    assert [(c.name, c.value) for c in node.children[0].children] \
+        == [('Color', 'red')]
+    assert [(c.name, c.value) for c in node.children[1].children] \
+        == [('Color', 'green')]
 
 def test_get_match_range_basic():
     fe = FeatureExtractor(name='Test', pattern=r'foo: (\w+)')
@@ -112,12 +114,12 @@ def test_get_match_range_children_no_match():
     node = matcher.extract(text)
     assert node.name == 'Root'
     assert len(node.children) == 2
-    assert {(c.name, c.value) for c in node.children} \
-        == {('Item1', None), ('Item2', None)}
-    assert {(c.name, c.value) for c in node.children[0].children} \
-        == {('Color', 'red')}
-    assert {(c.name, c.value) for c in node.children[1].children} \
-        == {('Color', 'green')}
+    assert [(c.name, c.value) for c in node.children] \
+        == [('Item1', None), ('Item2', None)]
+    assert [(c.name, c.value) for c in node.children[0].children] \
+        == [('Color', 'red')]
+    assert [(c.name, c.value) for c in node.children[1].children] \
+        == [('Color', 'green')]
 
 def test__extract_leaf_node_basic():
     # Should extract value from leaf node with pattern
@@ -169,3 +171,130 @@ def test__extract_internal_node_no_children_match():
     text = 'C: 30'
     node = parent._extract_internal_node(text)
     assert node is None
+
+def test_children_union_pattern():
+    # Children with patterns and matching flags are combined into one alternation
+    child1 = FeatureExtractor(name='Child1', pattern=r'A: (\d+)')
+    child2 = FeatureExtractor(name='Child2', pattern=r'B: (\d+)')
+    parent = FeatureExtractor(name='Parent', children=[child1, child2])
+    assert parent._children_re is not None
+    assert parent._children_re.search('x B: 2').lastgroup == '_c1'
+    # A child without a pattern, or a backreference, disables the union
+    assert FeatureExtractor(name='P', children=[child1, FeatureExtractor('C')])._children_re is None
+    backref = FeatureExtractor(name='Twice', pattern=r'(\w)\1')
+    assert FeatureExtractor(name='P', children=[child1, backref])._children_re is None
+
+def test_children_union_dispatch():
+    # The first union match stands in for that child's own search, including
+    # a match whose captured value is empty
+    child1 = FeatureExtractor(name='Child1', pattern=r'A: (\d+)')
+    child2 = FeatureExtractor(name='Child2', pattern=r'B:( *)')
+    parent = FeatureExtractor(name='Parent', children=[child1, child2])
+    for text in ('B: 2 A: 1', 'A: 1 B: 2', 'B:  A: 1', 'x A: 1'):
+        expected = [(*child.get_match_range(text), child) for child in parent.children]
+        ranges = parent._child_ranges(text, 0, len(text))
+        assert [r[:3] for r in ranges] == [r for r in expected if r[0] != -1]
+        assert [r[3] for r in ranges] == [r[2].extract(text).value for r in ranges]
+    assert parent._child_ranges('C: 3', 0, 4) is None
+
+def test_leaf_children_reuse_their_match():
+    # Leaves take their value from the match that gave their range, unless the
+    # pattern can see the end of the region, where searching the range again differs
+    assert FeatureExtractor(name='A', pattern=r'A: (\d+)')._reuses_match
+    assert not FeatureExtractor(name='A', pattern=r'A: (\d+)$')._reuses_match
+    lookahead = FeatureExtractor(name='X', pattern=r'(x(?!.b)|x.)')
+    assert not lookahead._reuses_match
+    parent = FeatureExtractor(name='Parent', children=[lookahead])
+    assert parent.extract('xyb').children[0].value == lookahead.extract('xyb', 0, 2).value
+
+def test__extract_leaf_node_reuses_split_values():
+    # Repeated captures reuse the cached split but get their own node, list and values
+    extractor = FeatureExtractor(name='Length', pattern=r'(\d+--\d+ mm)')
+    first = extractor.extract('3--15 mm')
+    second = extractor.extract('3--15 mm')
+    assert first is not second
+    assert first.values is not second.values
+    assert [v.raw_value for v in first.values] == ['3', '15']
+    assert first.values[0] is not second.values[0]
+    # Changing one node's values leaves other nodes and later extractions alone
+    first.values[0].unit = 'cm'
+    assert second.values[0].unit == 'mm'
+    assert extractor.extract('3--15 mm').values[0].unit == 'mm'
+
+def test_extract_region_matches_slice():
+    # Extracting a region gives the same result as extracting from its slice
+    child1 = FeatureExtractor(name='Child1', pattern=r'A: (\d+)')
+    child2 = FeatureExtractor(name='Child2', pattern=r'B: (\d+)')
+    parent = FeatureExtractor(name='Parent', children=[child1, child2])
+    text = 'A: 1; [A: 10; B: 20] B: 2'
+    start, end = text.index('['), text.index(']')
+    assert parent.extract(text, start, end).to_dict() == parent.extract(text[start:end]).to_dict()
+    assert child1.get_match_range(text, start, end) == (start + 1, start + 6)
+    # Anchored patterns still only match at the start of the region
+    anchored = FeatureExtractor(name='Anchored', pattern=r'^A: (\d+)')
+    assert anchored.extract(text, start + 1, end).value == '10'
+    assert anchored.extract(text, start, end) is None
+
+def test_anchored_patterns_use_match():
+    # A plain "^..." pattern runs as match() on the region, without slicing
+    anchored = FeatureExtractor(name='Anchored', pattern=r'^Stem:\s*(.+)')
+    assert anchored._region_mode == _MATCH
+    text = 'Habit: shrub. Stem: prickles'
+    start = text.index('Stem')
+    assert anchored.get_match_range(text, start) == (start, len(text))
+    assert anchored.get_match_range(text) == (-1, -1)
+    # Anchors inside an alternation keep the slicing fallback
+    assert FeatureExtractor(name='Either', pattern=r'^A: (\d+)|B: (\d+)')._region_mode == _SLICE
+
+def test_anchored_literal_prefix():
+    # "^Stem:" is checked as literal text before running the regex
+    stem = FeatureExtractor(name='Stem', pattern=r'^Stem:\s*(.+)')
+    assert stem._prefix == 'stem:'
+    assert stem.extract('stem: prickles').value == 'prickles'
+    assert stem.extract('Leaf: axis') is None
+    assert stem.extract('Stem: prickles', 0, 3) is None
+    # Case-insensitive matches beyond ASCII still reach the regex engine
+    kelvin = FeatureExtractor(name='K', pattern=r'^k: (\d+)')
+    assert kelvin.extract('\u212a: 5').value == '5'
+
+def test_unanchored_literal_prefix():
+    # A case-insensitive pattern is left to the regex, which finds a missing
+    # prefix as fast as a case-insensitive literal search would
+    prickle = FeatureExtractor(name='Prickle', pattern=r'prickles\s*([^\.]+)')
+    assert prickle._prefix == ''
+    assert prickle.extract('Stem: Prickles few.').value == 'few'
+    assert prickle.extract('Stem: hairs few.') is None
+    assert prickle.get_match_range('prickles few', 1) == (-1, -1)
+    # "A: " must appear somewhere in the region before a case-sensitive regex is run
+    exact = FeatureExtractor(name='Exact', pattern=re.compile(r'A: (\d+)'))
+    assert exact._prefix == 'A: '
+    assert exact.extract('a: 1 A: 2').value == '2'
+    assert exact.extract('a: 1') is None
+    # A top-level alternation has no required prefix
+    either = FeatureExtractor(name='X', pattern=r'hairy|(glabrous)')
+    assert either._prefix == ''
+    assert either.extract('glabrous').value == 'glabrous'
+    anchored = FeatureExtractor(name='Y', pattern=r'^hairy|(glabrous)')
+    assert anchored.extract('glabrous').value == 'glabrous'
+    # Non-ASCII text is left to the regex engine
+    kelvin = FeatureExtractor(name='K', pattern=r'xk: (\d+)')
+    assert kelvin.extract('x\u212a: 5').value == '5'
+
+def test_replacing_children_rebuilds_extraction():
+    # Setting children rebuilds the union and the leaf/internal dispatch
+    parent = FeatureExtractor(name='Parent', pattern=r'P: (\w+)')
+    assert parent.extract('P: x A: 1').value == 'x'
+    parent.children = [FeatureExtractor(name='Child1', pattern=r'A: (\d+)')]
+    node = parent.extract('P: x A: 1')
+    assert [(c.name, c.value) for c in node.children] == [('Child1', '1')]
+    parent.children = [FeatureExtractor(name='Child2', pattern=r'B: (\d+)')]
+    assert parent.extract('P: x A: 1') is None
+    # Adding a child rebuilds the derived state too
+    parent.add_child(FeatureExtractor(name='Child1', pattern=r'A: (\d+)'))
+    node = parent.extract('P: x A: 1')
+    assert [(c.name, c.value) for c in node.children] == [('Child1', '1')]
+    # Children can't be changed in place, and patterns can't be replaced
+    with pytest.raises(AttributeError):
+        parent.children.append(FeatureExtractor(name='Child1', pattern=r'A: (\d+)'))
+    with pytest.raises(AttributeError):
+        parent.children[0].pattern = r'A: (\d+)'
@@ -26,3 +26,64 @@ def test_feature_node_basic():
     d = node.to_dict()
     assert d['name'] == 'Root'
     assert d['children'][0]['name'] == 'Child1'
+
+def test_feature_node_find_preorder():
+    root = FeatureNode('Length')
+    stem = FeatureNode('Stem')
+    leaf = FeatureNode('Leaf')
+    stem_length = FeatureNode('length')
+    leaf_length = FeatureNode('Length')
+    root.add_child(stem)
+    root.add_child(leaf)
+    stem.add_child(stem_length)
+    leaf.add_child(leaf_length)
+
+    # Case-insensitive, in the same pre-order as a recursive walk
+    assert root.find('LENGTH') == [root, stem_length, leaf_length]
+    assert root.find('Missing') == []
+
+def test_feature_node_find_after_rename():
+    node = FeatureNode('Stem')
+    node.name = 'Leaf'
+    assert node.find('leaf') == [node]
+    assert node.find('stem') == []
+
+def test_feature_node_iter_find_is_lazy():
+    root = FeatureNode('Root')
+    first = FeatureNode('Length')
+    second = FeatureNode('Length')
+    root.add_child(first)
+    root.add_child(second)
+
+    matches = root.iter_find('length')
+    assert next(matches) is first
+    assert next(matches) is second
+    assert next(matches, None) is None
+
+def test_feature_node_to_dict_deep_tree():
+    # Deeper than the recursion limit would allow for a recursive walk
+    import sys
+    root = node = FeatureNode('Level0')
+    for i in range(1, sys.getrecursionlimit() + 10):
+        child = FeatureNode(f'Level{i}')
+        node.add_child(child)
+        node = child
+
+    d = root.to_dict()
+    depth = 0
+    while d['children']:
+        d = d['children'][0]
+        depth += 1
+    assert depth == sys.getrecursionlimit() + 9
+
+def test_feature_node_get_child():
+    root = FeatureNode('Root')
+    first = FeatureNode('Leaf')
+    root.add_child(first)
+    root.add_child(FeatureNode('Leaf'))
+    assert root.get_child('Leaf') is first
+    assert root.get_child('Stem') is None
+    # Children appended to the list directly are still found
+    stem = FeatureNode('Stem')
+    root.children.append(stem)
+    assert root.get_child('Stem') is stem
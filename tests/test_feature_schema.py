@@ -1,11 +1,21 @@
-from src.feature_schema import get_habit_feature_schema, get_stem_feature_schema, get_leaf_feature_schema
+import pytest
+from src.feature_schema import (
+    get_habit_feature_schema, get_stem_feature_schema, get_leaf_feature_schema, get_jepson_feature_schema
+)
 import logging
 logging.basicConfig(level=logging.DEBUG, force=True)
 
 from src.feature_node import FeatureNode
 
-def test_habit_feature_schema():
-    extractor = get_habit_feature_schema()
+
+@pytest.fixture(scope="session")
+def schemas():
+    return {"habit": get_habit_feature_schema(), "stem": get_stem_feature_schema(),
+            "leaf": get_leaf_feature_schema(), "jepson": get_jepson_feature_schema()}
+
+
+def test_habit_feature_schema(schemas):
+    extractor = schemas["habit"]
     text = 'Habit: shrub or thicket-forming, 8--25 dm.'
     node = extractor.extract(text)
     assert node.name == 'Habit'
@@ -33,8 +43,8 @@ def test_habit_feature_schema():
     assert height_node.values[1].unit == 'dm'
 
 
-def test_stem_feature_schema():
-    extractor = get_stem_feature_schema()
+def test_stem_feature_schema(schemas):
+    extractor = schemas["stem"]
     text = 'Stem: prickles few to many, paired or not, 3--15 mm, thick-based and compressed, generally curved (straight).'
     node = extractor.extract(text)
     assert node.name == 'Stem'
@@ -57,8 +67,8 @@ def test_stem_feature_schema():
     assert any(c.name == 'Shape' and 'thick-based' in c.value for c in prickle.children)
     assert any(c.name == 'Curvature' and 'curved' in c.value for c in prickle.children)
 
-def test_leaf_feature_schema():
-    extractor = get_leaf_feature_schema()
+def test_leaf_feature_schema(schemas):
+    extractor = schemas["leaf"]
     text = 'Leaf: axis +- shaggy-hairy (+- glabrous), hairs to 1 mm, glandless or glandular; leaflets 5--7(9), +- hairy, sometimes glandular; terminal leaflet generally 15--50 mm, +- ovate-elliptic, generally widest at or below middle, tip rounded to acute, margins single- or double-toothed, glandular or not.'
     node = extractor.extract(text)
     assert node.name == 'Leaf'
@@ -72,3 +82,9 @@ def test_leaf_feature_schema():
         c.name == 'Length' and c.values and c.values[0].raw_value == '1' and c.values[0].unit == 'mm'
         for c in trichome.children)
     assert any(c.name == 'Glandularity' and ('glandless' in c.value or 'glandular' in c.value) for c in trichome.children)
+
+
+def test_feature_schema_is_cached():
+    assert get_habit_feature_schema() is get_habit_feature_schema()
+    assert get_stem_feature_schema() is get_stem_feature_schema()
+    assert get_leaf_feature_schema() is get_leaf_feature_schema()
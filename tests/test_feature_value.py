@@ -52,3 +52,20 @@ def test_to_range():
     assert values[1].raw_value == '5'
     assert not values[1].is_range_start
     assert values[1].unit == 'mm'
+
+def test_first_delimiter_wins():
+    # Only the highest-priority delimiter present is split on
+    values = split_feature_values('few to many, paired')
+    assert [v.raw_value for v in values] == ['few', 'many, paired']
+    assert values[0].is_range_start
+
+def test_range_strips_matching_unit_only():
+    # A start value keeps its unit text when it differs from the range's unit
+    values = split_feature_values('3 mm--5 mm')
+    assert [(v.raw_value, v.unit) for v in values] == [('3', 'mm'), ('5', 'mm')]
+    values = split_feature_values('3 cm--5 mm')
+    assert [(v.raw_value, v.unit) for v in values] == [('3 cm', 'mm'), ('5', 'mm')]
+
+def test_to_dict():
+    value = split_feature_values('15 mm')[0]
+    assert value.to_dict() == {'raw_value': '15', 'qualifier': None, 'is_range_start': False, 'unit': 'mm'}
@@ -1,4 +1,8 @@
+import pytest
 from src.feature_schema import get_jepson_feature_schema
+from src.jepson_parser import (
+    UNMODELLED_SECTION_HEADERS, _section_header_re, parse_jepson_description, parse_jepson_descriptions
+)
 from src.feature_extractor import FeatureExtractor
 from src.feature_node import FeatureNode
 from src.feature_value import FeatureValue
@@ -10,19 +14,19 @@ def test_parse_jepson_description_tree():
     # Check root node
     assert tree.name == 'TaxonDescription'
     # Check detailed Habit section
-    habit = next(child for child in tree.children if child.name == 'Habit')
+    habit = tree.get_child('Habit')
     assert habit.children
-    habit_general = next(child for child in habit.children if child.name == 'General')
+    habit_general = habit.get_child('General')
     assert habit_general.children
     # Growth Form: shrub or thicket-forming
-    growth_form_node = next((c for c in habit_general.children if c.name == 'Growth Form'), None)
+    growth_form_node = habit_general.get_child('Growth Form')
     assert growth_form_node is not None
     assert len(growth_form_node.values) == 2
     assert growth_form_node.values[0].raw_value == 'shrub'
     assert growth_form_node.values[1].raw_value == 'thicket-forming'
 
     # Height: 8--25 dm
-    height_node = next((c for c in habit_general.children if c.name == 'Height'), None)
+    height_node = habit_general.get_child('Height')
     assert height_node is not None
     assert len(height_node.values) == 2
     assert height_node.values[0].raw_value == '8'
@@ -33,19 +37,19 @@ def test_parse_jepson_description_tree():
     assert height_node.values[1].unit == 'dm'
 
     # Check detailed Stem section
-    stem = next(child for child in tree.children if child.name == 'Stem')
-    prickle = next(child for child in stem.children if child.name == 'Prickle')
+    stem = tree.get_child('Stem')
+    prickle = stem.get_child('Prickle')
     # Count
-    count_node = next((c for c in prickle.children if c.name == 'Count'), None)
+    count_node = prickle.get_child('Count')
     assert count_node is not None
     assert count_node.values[0].raw_value == 'few'
     # Grouping
-    grouping_node = next((c for c in prickle.children if c.name == 'Grouping'), None)
+    grouping_node = prickle.get_child('Grouping')
     assert grouping_node is not None
     assert grouping_node.values[0].raw_value == 'paired'
     assert grouping_node.values[0].unit is None
     # Length: 3--15 mm
-    length_node = next((c for c in prickle.children if c.name == 'Length'), None)
+    length_node = prickle.get_child('Length')
     assert length_node is not None
     assert len(length_node.values) == 2
     assert length_node.values[0].raw_value == '3'
@@ -55,17 +59,85 @@ def test_parse_jepson_description_tree():
     assert length_node.values[1].is_range_start is False
     assert length_node.values[1].unit == 'mm'
     # Shape
-    shape_node = next((c for c in prickle.children if c.name == 'Shape'), None)
+    shape_node = prickle.get_child('Shape')
     assert shape_node is not None
     assert shape_node.values[0].raw_value == 'thick-based and compressed'
     assert shape_node.values[0].unit is None
     # Curvature
-    curvature_node = next((c for c in prickle.children if c.name == 'Curvature'), None)
+    curvature_node = prickle.get_child('Curvature')
     assert curvature_node is not None
     assert curvature_node.values[0].raw_value == 'generally curved (straight)'
 
     # Check detailed Leaf section
-    leaf = next(child for child in tree.children if child.name == 'Leaf')
-    axis = next((c for c in leaf.children if c.name == 'Axis'), None)
+    leaf = tree.get_child('Leaf')
+    axis = leaf.get_child('Axis')
     assert axis is not None
     assert any(gr.name == 'Trichome' for gr in axis.children)
+
+
+def test_parse_jepson_description_reuses_schema():
+    desc = 'Habit: shrub or thicket-forming, 8--25 dm. Stem: prickles few to many, 3--15 mm.'
+    first = parse_jepson_description(desc)
+    second = parse_jepson_description(desc)
+    assert first.to_dict() == second.to_dict()
+    assert first.to_dict() == get_jepson_feature_schema().extract(desc).to_dict()
+    assert get_jepson_feature_schema() is get_jepson_feature_schema()
+
+
+
+def test_parse_jepson_description_sections_end_at_next_header():
+    # The Leaf section stops at "Flower:", so the flower's axis isn't read as the leaf's
+    desc = 'Habit: shrub, 8--25 dm. Leaf: leaflets 5. Flower: axis glabrous;'
+    tree = parse_jepson_description(desc)
+    assert [c.name for c in tree.children] == ['Habit']
+    assert tree.get_child('Habit').to_dict() == get_jepson_feature_schema().extract(desc).get_child('Habit').to_dict()
+    assert parse_jepson_description('Ecology: moist areas.') is None
+
+
+def test_parse_jepson_description_checks_section_patterns():
+    # "Stem :" is a header to the scan, but not a Stem section to the schema
+    assert parse_jepson_description('Stem : prickles few.') is None
+    tree = parse_jepson_description('Stem : prickles few. Habit: shrub.')
+    assert [c.name for c in tree.children] == ['Habit']
+
+
+def test_parse_jepson_description_uses_first_section_with_a_node():
+    # The first Habit section yields nothing, so the later one is used
+    desc = 'Habit: 5 dm. Stem: prickles few. Habit: shrub or thicket-forming.'
+    tree = parse_jepson_description(desc)
+    assert [c.name for c in tree.children] == ['Stem', 'Habit']
+    habit = tree.get_child('Habit').get_child('General')
+    assert [v.raw_value for v in habit.get_child('Growth Form').values] == ['shrub', 'thicket-forming']
+
+def test_section_headers_cover_the_schema():
+    # Every section the schema extracts, and every unmodelled one, is a header to the scan
+    schema = get_jepson_feature_schema()
+    header_re = _section_header_re(schema)
+    for header in [child.name for child in schema.children] + list(UNMODELLED_SECTION_HEADERS):
+        m = header_re.match(f'{header}: x')
+        assert m is not None and m.group(1) == header
+
+
+def test_extract_matched():
+    # A section's own pattern is checked before its children are extracted
+    stem = get_jepson_feature_schema().children[1]
+    assert stem.extract_matched('Stem : prickles few.') is None
+    assert stem.extract('Stem : prickles few.') is not None
+    desc = 'Habit: shrub. Stem: prickles few.'
+    start = desc.index('Stem')
+    assert stem.extract_matched(desc, start).to_dict() == stem.extract(desc, start).to_dict()
+    # A leaf takes its value from the match
+    leaf = FeatureExtractor(name='Fruit', pattern=r'Fruit:\s*([^.]+)')
+    assert leaf.extract_matched('Fruit: ovoid.').value == 'ovoid'
+    assert leaf.extract_matched('Fruit: ovoid.', 1) is None
+
+
+@pytest.mark.parametrize('workers', [1, 2])
+def test_parse_jepson_descriptions(workers):
+    descs = [
+        'Habit: shrub or thicket-forming, 8--25 dm.',
+        'Stem: prickles few to many, 3--15 mm.',
+        'Leaf: axis glabrous, hairs to 1 mm, glandular;',
+    ]
+    trees = parse_jepson_descriptions(descs, workers=workers)
+    assert [t.to_dict() for t in trees] == [parse_jepson_description(d).to_dict() for d in descs]